@@ -112,11 +112,10 @@ async def enrich_personal_context(state: AdvisorState) -> dict:
     """Fetch user's personal context (life events)."""
     from app.context.repository import ContextRepository
     from app.context.service import ContextService
-    from app.database import get_db
+    from app.database import get_pool
     from app.event_store.service import EventStoreService
 
-    db = get_db()
-    service = ContextService(EventStoreService(db), ContextRepository(db))
+    service = ContextService(EventStoreService(get_pool()), ContextRepository(get_pool()))
     profile = await service.get_assembled_profile()
     return {"personal_context": profile}
 
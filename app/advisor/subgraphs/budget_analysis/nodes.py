@@ -8,7 +8,7 @@ import structlog
 
 from app.advisor.subgraphs.budget_analysis.state import BudgetAnalysisState
 from app.budgets.repository import BudgetRepository
-from app.database import get_db
+from app.database import get_pool
 
 logger = structlog.get_logger()
 
@@ -19,7 +19,7 @@ _CRITICAL_THRESHOLD = 1.2
 
 async def fetch_budgets(state: BudgetAnalysisState) -> dict:
     """Fetch all active budgets."""
-    repo = BudgetRepository(get_db())
+    repo = BudgetRepository(get_pool())
     budgets = await repo.list_all(active_only=True)
     logger.info("fetch_budgets", count=len(budgets))
     return {"budgets": budgets}
@@ -31,7 +31,7 @@ async def calculate_utilization(state: BudgetAnalysisState) -> dict:
     if not budgets:
         return {"utilization": []}
 
-    repo = BudgetRepository(get_db())
+    repo = BudgetRepository(get_pool())
     all_usage = await repo.get_all_usage()
 
     utilization: list[dict] = []
@@ -9,8 +9,8 @@ from collections import defaultdict
 import structlog
 
 from app.advisor.subgraphs.financial_analysis.state import FinancialAnalysisState
-from app.database import get_db
-from app.transactions.repository import TransactionRepository
+from app.database import get_pool
+from app.transactions.repository import TransactionRepository, transaction_row_to_dict
 
 logger = structlog.get_logger()
 
@@ -20,9 +20,9 @@ _DEFAULT_PERIOD_MONTHS = 3
 async def fetch_transactions(state: FinancialAnalysisState) -> dict:
     """Fetch recent transactions and aggregate spending by category."""
     period = state.get("period_months", _DEFAULT_PERIOD_MONTHS)
-    repo = TransactionRepository(get_db())
+    repo = TransactionRepository(get_pool())
 
-    transactions = await repo.get_recent(months=period)
+    transactions = [transaction_row_to_dict(row) for row in await repo.get_recent(months=period)]
     logger.info("fetch_transactions", count=len(transactions), period_months=period)
 
     spending_by_category: dict[str, float] = defaultdict(float)
@@ -50,13 +50,11 @@ async def generate_recommendation(state: MarketAnalysisState) -> dict:
     from app.llm.factory import LLMFactory
     from app.market.providers.yahoo_finance import YahooFinanceProvider
     from app.market.service import MarketService
-    from app.sentiment.service import SentimentService
     from app.trades.service import TradeService
 
     ticker = state["ticker"]
     market_service = MarketService(YahooFinanceProvider())
-    sentiment_service = SentimentService(LLMFactory.create())
-    trade_service = TradeService(market_service, sentiment_service, LLMFactory.create())
+    trade_service = TradeService(market_service, LLMFactory.create())
 
     recommendations = await trade_service.get_recommendations(
         tickers=[ticker], risk_tolerance="medium"
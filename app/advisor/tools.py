@@ -22,15 +22,15 @@ async def query_transactions(
         category: Transaction category to filter by.
         limit: Max number of results.
     """
-    from app.database import get_db
-    from app.transactions.repository import TransactionRepository
+    from app.database import get_pool
+    from app.transactions.repository import TransactionRepository, transaction_row_to_dict
     from app.transactions.schemas import TransactionFilter
 
-    repo = TransactionRepository(get_db())
+    repo = TransactionRepository(get_pool())
     filters = TransactionFilter(
         date_from=date_from, date_to=date_to, category=category, limit=limit
     )
-    return await repo.list_filtered(filters)
+    return [transaction_row_to_dict(row) for row in await repo.list_filtered(filters)]
 
 
 @tool
@@ -40,11 +40,11 @@ async def get_monthly_summary(year_month: str | None = None) -> list[dict]:
     Args:
         year_month: Optional month to filter by in YYYY-MM format.
     """
-    from app.database import get_db
-    from app.transactions.repository import TransactionRepository
+    from app.database import get_pool
+    from app.transactions.repository import TransactionRepository, summary_row_to_dict
 
-    repo = TransactionRepository(get_db())
-    return await repo.get_summary(year_month)
+    repo = TransactionRepository(get_pool())
+    return [summary_row_to_dict(row) for row in await repo.get_summary(year_month)]
 
 
 @tool
@@ -56,11 +56,10 @@ async def get_budget_status(category: str | None = None) -> list[dict]:
     """
     from app.budgets.repository import BudgetRepository
     from app.budgets.service import BudgetService
-    from app.database import get_db
+    from app.database import get_pool
     from app.event_store.service import EventStoreService
 
-    db = get_db()
-    service = BudgetService(EventStoreService(db), BudgetRepository(db))
+    service = BudgetService(EventStoreService(get_pool()), BudgetRepository(get_pool()))
     return await service.get_status(category)
 
 
@@ -71,10 +70,10 @@ async def calculate_savings_rate(months: int = 3) -> dict:
     Args:
         months: Number of recent months to analyze.
     """
-    from app.database import get_db
+    from app.database import get_pool
     from app.transactions.repository import TransactionRepository
 
-    repo = TransactionRepository(get_db())
+    repo = TransactionRepository(get_pool())
     return await repo.calculate_savings_rate(months)
 
 
@@ -86,10 +85,10 @@ async def get_spending_trend(category: str, months: int = 6) -> list[dict]:
         category: The spending category to analyze.
         months: Number of months to look back.
     """
-    from app.database import get_db
+    from app.database import get_pool
     from app.transactions.repository import TransactionRepository
 
-    repo = TransactionRepository(get_db())
+    repo = TransactionRepository(get_pool())
     return await repo.get_spending_trend(category, months)
 
 
@@ -137,13 +136,10 @@ async def get_trade_recommendations(
     from app.llm.factory import LLMFactory
     from app.market.providers.yahoo_finance import YahooFinanceProvider
     from app.market.service import MarketService
-    from app.sentiment.service import SentimentService
     from app.trades.service import TradeService
 
-    llm = LLMFactory.create()
     market_service = MarketService(YahooFinanceProvider())
-    sentiment_service = SentimentService(llm)
-    trade_service = TradeService(market_service, sentiment_service, llm)
+    trade_service = TradeService(market_service, LLMFactory.create())
 
     ticker_list = [t.strip() for t in tickers.split(",")]
     results = await trade_service.get_recommendations(ticker_list, risk_tolerance)
@@ -0,0 +1,129 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from functools import partial
+
+
+class AsyncTTLCache[V]:
+    """In-process LRU cache with per-entry expiry and single-flight loading.
+
+    Concurrent misses for the same key share one in-flight load; failed loads
+    are not cached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, V]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future[V]] = {}
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._inflight[key] = future
+            future.add_done_callback(partial(self._on_loaded, key))
+        # Shield so one caller being cancelled does not cancel the shared load.
+        return await asyncio.shield(future)
+
+    async def get_or_load_many(
+        self,
+        keys: Iterable[Hashable],
+        loader: Callable[[list[Hashable]], Awaitable[dict[Hashable, V]]],
+    ) -> dict[Hashable, V]:
+        """Return values for `keys`, loading every miss through one `loader` call.
+
+        `loader` receives the keys that are neither cached nor already loading and
+        returns values for the ones it could load. Keys another caller is loading
+        are awaited rather than reloaded. Keys that fail to load are left out.
+        """
+        results: dict[Hashable, V] = {}
+        waiting: dict[Hashable, asyncio.Future[V]] = {}
+        missing: list[Hashable] = []
+        for key in dict.fromkeys(keys):
+            value = self.get(key)
+            if value is not None:
+                results[key] = value
+            elif (future := self._inflight.get(key)) is not None:
+                waiting[key] = future
+            else:
+                missing.append(key)
+
+        if missing:
+            # Start the load before registering the keys as in flight, so a loader that
+            # raises on the call leaves no unresolved futures behind for later callers.
+            batch = asyncio.ensure_future(loader(missing))
+            loop = asyncio.get_running_loop()
+            futures = [loop.create_future() for _ in missing]
+            for key, future in zip(missing, futures, strict=True):
+                self._inflight[key] = future
+                future.add_done_callback(partial(self._on_loaded, key))
+                waiting[key] = future
+            batch.add_done_callback(partial(self._resolve_batch, missing, futures))
+
+        for key, future in waiting.items():
+            try:
+                # Shield so one caller being cancelled does not cancel the shared load.
+                results[key] = await asyncio.shield(future)
+            except Exception:
+                continue
+        return results
+
+    def get(self, key: Hashable) -> V | None:
+        """Return a fresh cached value without loading on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry; loads already in flight finish but are not stored."""
+        self._entries.clear()
+        self._inflight.clear()
+
+    @staticmethod
+    def _resolve_batch(
+        keys: list[Hashable],
+        futures: list[asyncio.Future[V]],
+        batch: asyncio.Future[dict[Hashable, V]],
+    ) -> None:
+        failure: BaseException | None = None
+        if batch.cancelled():
+            failure = RuntimeError("batch load was cancelled")
+        elif batch.exception() is not None:
+            failure = batch.exception()
+        values = batch.result() if failure is None else {}
+        for key, future in zip(keys, futures, strict=True):
+            if future.done():
+                continue
+            if failure is not None:
+                future.set_exception(failure)
+            elif key in values:
+                future.set_result(values[key])
+            else:
+                future.set_exception(KeyError(key))
+
+    def _on_loaded(self, key: Hashable, future: asyncio.Future[V]) -> None:
+        if self._inflight.get(key) is not future:
+            # Superseded by clear(); the result may predate a write.
+            return
+        del self._inflight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.set(key, future.result())
@@ -19,6 +19,7 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO")
     db_path: str = Field(default="finance_advisor.db")
     cors_origins: str = Field(default="http://localhost:3000")
+    max_upload_bytes: int = Field(default=20 * 1024 * 1024, gt=0)
 
     # Phase 3
     alpha_vantage_api_key: str = Field(default="")
@@ -0,0 +1,25 @@
+import os
+
+# Settings are read at import time; give the required fields test values first.
+os.environ.setdefault("FA_API_KEY", "test-api-key")
+os.environ.setdefault("FA_AUTH_PASSWORD", "test-password")
+os.environ.setdefault("FA_JWT_SECRET", "test-jwt-secret-at-least-32-characters")
+
+import pytest  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import close_database, get_pool, init_database  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch) -> str:
+    path = str(tmp_path / "test.db")
+    monkeypatch.setattr(settings, "db_path", path)
+    return path
+
+
+@pytest.fixture
+async def pool(db_path):
+    await init_database()
+    yield get_pool()
+    await close_database()
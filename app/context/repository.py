@@ -1,25 +1,29 @@
-import aiosqlite
+from app.database import SqlitePool
 
 
 class ContextRepository:
-    def __init__(self, db: aiosqlite.Connection) -> None:
-        self._db = db
+    """Read-only queries over the life events projection, served from the read pool."""
+
+    def __init__(self, pool: SqlitePool) -> None:
+        self._pool = pool
 
     async def get_by_id(self, event_id: str) -> dict | None:
-        cursor = await self._db.execute(
-            "SELECT * FROM life_events_projection WHERE id = ? AND is_deleted = 0",
-            (event_id,),
-        )
-        row = await cursor.fetchone()
+        async with self._pool.read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM life_events_projection WHERE id = ? AND is_deleted = 0",
+                (event_id,),
+            )
+            row = await cursor.fetchone()
         if row is None:
             return None
         return dict(row)
 
     async def list_all(self) -> list[dict]:
-        cursor = await self._db.execute(
-            "SELECT * FROM life_events_projection WHERE is_deleted = 0 ORDER BY date DESC"
-        )
-        rows = await cursor.fetchall()
+        async with self._pool.read() as db:
+            cursor = await db.execute(
+                "SELECT * FROM life_events_projection WHERE is_deleted = 0 ORDER BY date DESC"
+            )
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
     async def get_profile(self) -> dict:
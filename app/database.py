@@ -1,3 +1,8 @@
+import asyncio
+import contextlib
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import aiosqlite
@@ -7,7 +12,19 @@ from app.config import settings
 
 logger = structlog.get_logger()
 
-_db: aiosqlite.Connection | None = None
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA mmap_size=268435456",
+]
+
+# Autocheckpoints are PASSIVE and never shrink the WAL file; truncate it periodically.
+WAL_CHECKPOINT_INTERVAL_SECONDS = 60
 
 DDL_STATEMENTS = [
     """
@@ -16,14 +33,28 @@ DDL_STATEMENTS = [
         aggregate_type TEXT NOT NULL,
         aggregate_id TEXT NOT NULL,
         event_type TEXT NOT NULL,
-        event_data TEXT NOT NULL,
+        event_data BLOB NOT NULL,
         metadata TEXT,
         version INTEGER NOT NULL,
         created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        idempotency_key TEXT,
         UNIQUE(aggregate_id, version)
     )
     """,
     """
+    CREATE INDEX IF NOT EXISTS idx_events_type_created
+    ON events(aggregate_type, created_at DESC)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_events_created
+    ON events(created_at DESC)
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_events_idempotency_key
+    ON events(idempotency_key)
+    WHERE idempotency_key IS NOT NULL
+    """,
+    """
     CREATE TABLE IF NOT EXISTS transactions_projection (
         id TEXT PRIMARY KEY,
         type TEXT NOT NULL,
@@ -49,6 +80,20 @@ DDL_STATEMENTS = [
     )
     """,
     """
+    CREATE INDEX IF NOT EXISTS idx_txn_active_date
+    ON transactions_projection(date DESC)
+    WHERE is_deleted = 0
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_txn_active_category_date
+    ON transactions_projection(category, date DESC)
+    WHERE is_deleted = 0
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_summary_category_month
+    ON monthly_summary_projection(category, year_month)
+    """,
+    """
     CREATE TABLE IF NOT EXISTS budgets_projection (
         id TEXT PRIMARY KEY,
         category TEXT NOT NULL UNIQUE,
@@ -73,36 +118,142 @@ DDL_STATEMENTS = [
 ]
 
 
+class SqlitePool:
+    """One serialized write connection plus a queue of read connections.
+
+    SQLite in WAL mode allows concurrent readers alongside a single writer, so
+    reads check out a connection from the queue while all writes go through
+    `write_conn` inside `transaction()`.
+    """
+
+    def __init__(
+        self, write_conn: aiosqlite.Connection, read_conns: list[aiosqlite.Connection]
+    ) -> None:
+        self.write_conn = write_conn
+        self._read_conns: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for conn in read_conns:
+            self._read_conns.put_nowait(conn)
+        self._all_read_conns = read_conns
+        self._write_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Check out a read connection for the duration of the block."""
+        conn = await self._read_conns.get()
+        try:
+            yield conn
+        finally:
+            self._read_conns.put_nowait(conn)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Run the block in a `BEGIN IMMEDIATE` transaction on the write connection."""
+        async with self._write_lock:
+            await self.write_conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.write_conn
+                # A failed commit (e.g. SQLITE_BUSY) must also roll back, or the shared
+                # write connection stays inside the transaction.
+                await self.write_conn.commit()
+            except BaseException:
+                await self.write_conn.rollback()
+                raise
+
+    async def checkpoint(self) -> None:
+        """Copy the WAL back into the database file and truncate it, between transactions."""
+        async with self._write_lock:
+            cursor = await self.write_conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            busy, wal_pages, checkpointed_pages = await cursor.fetchone()
+        if busy:
+            logger.warning(
+                "wal_checkpoint_busy", wal_pages=wal_pages, checkpointed_pages=checkpointed_pages
+            )
+
+    async def close(self) -> None:
+        for conn in self._all_read_conns:
+            await conn.close()
+        await self.write_conn.close()
+
+
+_pool: SqlitePool | None = None
+_checkpoint_task: asyncio.Task[None] | None = None
+
+
+async def _open_connection(*, read_only: bool = False) -> aiosqlite.Connection:
+    conn = await aiosqlite.connect(settings.db_path)
+    conn.row_factory = aiosqlite.Row
+    for pragma in CONNECTION_PRAGMAS:
+        await conn.execute(pragma)
+    if read_only:
+        await conn.execute("PRAGMA query_only=ON")
+    return conn
+
+
 async def init_database() -> None:
-    global _db
+    global _pool, _checkpoint_task
     Path(settings.db_path).parent.mkdir(parents=True, exist_ok=True)
-    _db = await aiosqlite.connect(settings.db_path)
-    _db.row_factory = aiosqlite.Row
-    await _db.execute("PRAGMA journal_mode=WAL")
-    await _db.execute("PRAGMA foreign_keys=ON")
+    write_conn = await _open_connection()
 
+    await _migrate_events_idempotency_key(write_conn)
     for ddl in DDL_STATEMENTS:
-        await _db.execute(ddl)
-    await _db.commit()
+        await write_conn.execute(ddl)
+    await write_conn.commit()
+
+    read_conns = [await _open_connection(read_only=True) for _ in range(os.cpu_count() or 1)]
+    _pool = SqlitePool(write_conn, read_conns)
+    _checkpoint_task = asyncio.create_task(_checkpoint_periodically(_pool))
+
+    logger.info("database_initialized", path=settings.db_path, read_connections=len(read_conns))
+
+
+async def _migrate_events_idempotency_key(conn: aiosqlite.Connection) -> None:
+    """Move idempotency keys from event metadata into their own indexed column."""
+    cursor = await conn.execute("PRAGMA table_info(events)")
+    columns = {row["name"] for row in await cursor.fetchall()}
+    if not columns or "idempotency_key" in columns:
+        return
+
+    await conn.execute("ALTER TABLE events ADD COLUMN idempotency_key TEXT")
+    await conn.execute(
+        """
+        UPDATE events
+        SET idempotency_key = json_extract(metadata, '$.idempotency_key')
+        WHERE metadata IS NOT NULL
+        """
+    )
+    await conn.execute("DROP INDEX IF EXISTS idx_events_idempotency")
+    logger.info("database_migrated", change="events.idempotency_key")
+
 
-    logger.info("database_initialized", path=settings.db_path)
+async def _checkpoint_periodically(pool: SqlitePool) -> None:
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_INTERVAL_SECONDS)
+        try:
+            await pool.checkpoint()
+        except aiosqlite.Error as exc:
+            logger.warning("wal_checkpoint_failed", error=str(exc))
 
 
 async def close_database() -> None:
-    global _db
-    if _db is not None:
-        await _db.close()
-        _db = None
+    global _pool, _checkpoint_task
+    if _checkpoint_task is not None:
+        _checkpoint_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _checkpoint_task
+        _checkpoint_task = None
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
         logger.info("database_closed")
 
 
-def get_db() -> aiosqlite.Connection:
-    if _db is None:
+def get_pool() -> SqlitePool:
+    if _pool is None:
         raise RuntimeError("Database not initialized. Call init_database() first.")
-    return _db
+    return _pool
 
 
 async def check_health() -> None:
-    db = get_db()
-    cursor = await db.execute("SELECT 1")
-    await cursor.close()
+    async with get_pool().read() as db:
+        cursor = await db.execute("SELECT 1")
+        await cursor.close()
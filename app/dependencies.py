@@ -1,6 +1,5 @@
 from typing import Annotated
 
-import aiosqlite
 from fastapi import Depends
 
 from app.advisor.service import AdvisorService
@@ -9,7 +8,7 @@ from app.budgets.repository import BudgetRepository
 from app.budgets.service import BudgetService
 from app.context.repository import ContextRepository
 from app.context.service import ContextService
-from app.database import get_db
+from app.database import get_pool
 from app.event_store.service import EventStoreService
 from app.market.providers.yahoo_finance import YahooFinanceProvider
 from app.market.service import MarketService
@@ -19,16 +18,15 @@ from app.transactions.importers.service import ImportService
 from app.transactions.repository import TransactionRepository
 from app.transactions.service import TransactionService
 
-DBConn = Annotated[aiosqlite.Connection, Depends(get_db)]
 APIKey = Annotated[dict, Depends(verify_token)]
 
 
 def get_event_store() -> EventStoreService:
-    return EventStoreService(get_db())
+    return EventStoreService(get_pool())
 
 
 def get_transaction_repo() -> TransactionRepository:
-    return TransactionRepository(get_db())
+    return TransactionRepository(get_pool())
 
 
 def get_transaction_service() -> TransactionService:
@@ -36,7 +34,7 @@ def get_transaction_service() -> TransactionService:
 
 
 def get_budget_repo() -> BudgetRepository:
-    return BudgetRepository(get_db())
+    return BudgetRepository(get_pool())
 
 
 def get_budget_service() -> BudgetService:
@@ -44,7 +42,7 @@ def get_budget_service() -> BudgetService:
 
 
 def get_context_repo() -> ContextRepository:
-    return ContextRepository(get_db())
+    return ContextRepository(get_pool())
 
 
 def get_context_service() -> ContextService:
@@ -78,7 +76,7 @@ def get_sentiment_service() -> SentimentService:
 def get_trade_service() -> TradeService:
     from app.llm.factory import LLMFactory
 
-    return TradeService(get_market_service(), get_sentiment_service(), LLMFactory.create())
+    return TradeService(get_market_service(), LLMFactory.create())
 
 
 MarketServiceDep = Annotated[MarketService, Depends(get_market_service)]
@@ -26,7 +26,8 @@ class Event:
     aggregate_type: str
     aggregate_id: str
     event_type: str
-    event_data: str
+    event_data: bytes
     metadata: str | None
     version: int
     created_at: str
+    idempotency_key: str | None = None
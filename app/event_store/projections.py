@@ -1,6 +1,5 @@
-import json
-
 import aiosqlite
+import orjson
 import structlog
 
 from app.event_store.models import Event, EventType
@@ -9,13 +8,34 @@ logger = structlog.get_logger()
 
 
 class ProjectionEngine:
+    _HANDLERS: dict[str, str] = {
+        EventType.transaction_created.value: "_handle_transaction_created",
+        EventType.transaction_updated.value: "_handle_transaction_updated",
+        EventType.transaction_deleted.value: "_handle_transaction_deleted",
+        EventType.budget_created.value: "_handle_budget_created",
+        EventType.budget_updated.value: "_handle_budget_updated",
+        EventType.budget_deleted.value: "_handle_budget_deleted",
+        EventType.life_event_created.value: "_handle_life_event_created",
+        EventType.life_event_updated.value: "_handle_life_event_updated",
+        EventType.life_event_deleted.value: "_handle_life_event_deleted",
+    }
+
     def __init__(self, db: aiosqlite.Connection) -> None:
         self._db = db
+        # Pending (income, expenses, count) deltas per (year_month, category),
+        # written by flush() so hot summary rows get one UPSERT per transaction.
+        self._summary_deltas: dict[tuple[str, str], tuple[float, float, int]] = {}
 
-    async def project(self, event: Event) -> None:
+    async def project(self, event: Event, data: dict | None = None) -> None:
+        """Apply `event` to the projections.
+
+        Callers that still hold the decoded payload pass it as `data` so the
+        JSON stored in `event.event_data` is not parsed again.
+        """
         handler = self._get_handler(event.event_type)
         if handler is not None:
-            data = json.loads(event.event_data)
+            if data is None:
+                data = orjson.loads(event.event_data)
             await handler(event, data)
             logger.info(
                 "projection_applied",
@@ -23,19 +43,46 @@ class ProjectionEngine:
                 aggregate_id=event.aggregate_id,
             )
 
+    async def flush(self) -> None:
+        """Write buffered monthly summary deltas; call before committing."""
+        if not self._summary_deltas:
+            return
+        rows = [
+            (year_month, category, income, expenses, count)
+            for (year_month, category), (income, expenses, count) in self._summary_deltas.items()
+        ]
+        self._summary_deltas.clear()
+        await self._db.executemany(
+            """
+            INSERT INTO monthly_summary_projection (
+                year_month, category, total_income, total_expenses, transaction_count
+            ) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(year_month, category) DO UPDATE SET
+                total_income = total_income + excluded.total_income,
+                total_expenses = total_expenses + excluded.total_expenses,
+                transaction_count = transaction_count + excluded.transaction_count
+            """,
+            rows,
+        )
+
+    def discard_pending(self) -> None:
+        """Drop buffered deltas after the surrounding transaction was rolled back."""
+        self._summary_deltas.clear()
+
+    def _add_summary_delta(
+        self, year_month: str, category: str, income: float, expenses: float, count: int
+    ) -> None:
+        key = (year_month, category)
+        pending = self._summary_deltas.get(key)
+        if pending is not None:
+            income += pending[0]
+            expenses += pending[1]
+            count += pending[2]
+        self._summary_deltas[key] = (income, expenses, count)
+
     def _get_handler(self, event_type: str):
-        handlers = {
-            EventType.transaction_created: self._handle_transaction_created,
-            EventType.transaction_updated: self._handle_transaction_updated,
-            EventType.transaction_deleted: self._handle_transaction_deleted,
-            EventType.budget_created: self._handle_budget_created,
-            EventType.budget_updated: self._handle_budget_updated,
-            EventType.budget_deleted: self._handle_budget_deleted,
-            EventType.life_event_created: self._handle_life_event_created,
-            EventType.life_event_updated: self._handle_life_event_updated,
-            EventType.life_event_deleted: self._handle_life_event_deleted,
-        }
-        return handlers.get(event_type)
+        name = self._HANDLERS.get(event_type)
+        return getattr(self, name) if name is not None else None
 
     async def _handle_transaction_created(self, event: Event, data: dict) -> None:
         await self._db.execute(
@@ -57,7 +104,9 @@ class ProjectionEngine:
                 event.created_at,
             ),
         )
-        await self._update_monthly_summary(data)
+        self._update_monthly_summary(
+            data["date"][:7], data["category"], data["amount"], data["type"]
+        )
 
     async def _handle_transaction_updated(self, event: Event, data: dict) -> None:
         cursor = await self._db.execute(
@@ -72,14 +121,6 @@ class ProjectionEngine:
         if old_row is None:
             return
 
-        old_data = {
-            "type": old_row["type"],
-            "amount": old_row["amount"],
-            "category": old_row["category"],
-            "date": old_row["date"],
-        }
-        await self._reverse_monthly_summary(old_data)
-
         new_amount = data.get("amount", old_row["amount"])
         new_category = data.get("category", old_row["category"])
         new_description = data.get("description", old_row["description"])
@@ -101,13 +142,19 @@ class ProjectionEngine:
             ),
         )
 
-        updated_data = {
-            "type": old_row["type"],
-            "amount": new_amount,
-            "category": new_category,
-            "date": new_date,
-        }
-        await self._update_monthly_summary(updated_data)
+        # The type never changes on update, so only one of income/expenses moves.
+        is_income = old_row["type"] == "income"
+        is_expense = old_row["type"] == "expense"
+        old_key = (old_row["date"][:7], old_row["category"])
+        new_key = (new_date[:7], new_category)
+        if old_key == new_key:
+            diff = new_amount - old_row["amount"]
+            self._add_summary_delta(
+                *new_key, diff if is_income else 0.0, diff if is_expense else 0.0, 0
+            )
+        else:
+            self._reverse_monthly_summary(*old_key, old_row["amount"], old_row["type"])
+            self._update_monthly_summary(*new_key, new_amount, old_row["type"])
 
     async def _handle_transaction_deleted(self, event: Event, data: dict) -> None:
         cursor = await self._db.execute(
@@ -130,62 +177,25 @@ class ProjectionEngine:
         )
 
         if old_row is not None:
-            old_data = {
-                "type": old_row["type"],
-                "amount": old_row["amount"],
-                "category": old_row["category"],
-                "date": old_row["date"],
-            }
-            await self._reverse_monthly_summary(old_data)
-
-    async def _update_monthly_summary(self, data: dict) -> None:
-        year_month = data["date"][:7]
-        category = data["category"]
-        amount = data["amount"]
-        txn_type = data["type"]
+            self._reverse_monthly_summary(
+                old_row["date"][:7], old_row["category"], old_row["amount"], old_row["type"]
+            )
 
+    def _update_monthly_summary(
+        self, year_month: str, category: str, amount: float, txn_type: str
+    ) -> None:
         income_delta = amount if txn_type == "income" else 0.0
         expense_delta = amount if txn_type == "expense" else 0.0
 
-        await self._db.execute(
-            """
-            INSERT INTO monthly_summary_projection (
-                year_month, category, total_income, total_expenses, transaction_count
-            ) VALUES (?, ?, ?, ?, 1)
-            ON CONFLICT(year_month, category) DO UPDATE SET
-                total_income = total_income + ?,
-                total_expenses = total_expenses + ?,
-                transaction_count = transaction_count + 1
-            """,
-            (
-                year_month,
-                category,
-                income_delta,
-                expense_delta,
-                income_delta,
-                expense_delta,
-            ),
-        )
-
-    async def _reverse_monthly_summary(self, data: dict) -> None:
-        year_month = data["date"][:7]
-        category = data["category"]
-        amount = data["amount"]
-        txn_type = data["type"]
+        self._add_summary_delta(year_month, category, income_delta, expense_delta, 1)
 
+    def _reverse_monthly_summary(
+        self, year_month: str, category: str, amount: float, txn_type: str
+    ) -> None:
         income_delta = amount if txn_type == "income" else 0.0
         expense_delta = amount if txn_type == "expense" else 0.0
 
-        await self._db.execute(
-            """
-            UPDATE monthly_summary_projection
-            SET total_income = total_income - ?,
-                total_expenses = total_expenses - ?,
-                transaction_count = transaction_count - 1
-            WHERE year_month = ? AND category = ?
-            """,
-            (income_delta, expense_delta, year_month, category),
-        )
+        self._add_summary_delta(year_month, category, -income_delta, -expense_delta, -1)
 
     async def _handle_budget_created(self, event: Event, data: dict) -> None:
         await self._db.execute(
@@ -204,30 +214,23 @@ class ProjectionEngine:
         )
 
     async def _handle_budget_updated(self, event: Event, data: dict) -> None:
-        set_clauses: list[str] = []
-        params: list = []
-
-        if "monthly_limit" in data:
-            set_clauses.append("monthly_limit = ?")
-            params.append(data["monthly_limit"])
-        if "category" in data:
-            set_clauses.append("category = ?")
-            params.append(data["category"])
-        if "is_active" in data:
-            set_clauses.append("is_active = ?")
-            params.append(1 if data["is_active"] else 0)
-
-        set_clauses.append("updated_at = ?")
-        params.append(event.created_at)
-        params.append(event.aggregate_id)
-
+        is_active = data.get("is_active")
         await self._db.execute(
-            f"""
+            """
             UPDATE budgets_projection
-            SET {", ".join(set_clauses)}
+            SET monthly_limit = COALESCE(?, monthly_limit),
+                category = COALESCE(?, category),
+                is_active = COALESCE(?, is_active),
+                updated_at = ?
             WHERE id = ?
             """,
-            params,
+            (
+                data.get("monthly_limit"),
+                data.get("category"),
+                None if is_active is None else int(bool(is_active)),
+                event.created_at,
+                event.aggregate_id,
+            ),
         )
 
     async def _handle_budget_deleted(self, event: Event, data: dict) -> None:
@@ -260,33 +263,24 @@ class ProjectionEngine:
         )
 
     async def _handle_life_event_updated(self, event: Event, data: dict) -> None:
-        set_clauses: list[str] = []
-        params: list = []
-
-        if "event_type" in data:
-            set_clauses.append("event_type = ?")
-            params.append(data["event_type"])
-        if "description" in data:
-            set_clauses.append("description = ?")
-            params.append(data["description"])
-        if "date" in data:
-            set_clauses.append("date = ?")
-            params.append(data["date"])
-        if "impact" in data:
-            set_clauses.append("impact = ?")
-            params.append(data["impact"])
-
-        set_clauses.append("updated_at = ?")
-        params.append(event.created_at)
-        params.append(event.aggregate_id)
-
         await self._db.execute(
-            f"""
+            """
             UPDATE life_events_projection
-            SET {", ".join(set_clauses)}
+            SET event_type = COALESCE(?, event_type),
+                description = COALESCE(?, description),
+                date = COALESCE(?, date),
+                impact = COALESCE(?, impact),
+                updated_at = ?
             WHERE id = ?
             """,
-            params,
+            (
+                data.get("event_type"),
+                data.get("description"),
+                data.get("date"),
+                data.get("impact"),
+                event.created_at,
+                event.aggregate_id,
+            ),
         )
 
     async def _handle_life_event_deleted(self, event: Event, data: dict) -> None:
@@ -1,34 +1,98 @@
+import sys
+
 import aiosqlite
 import structlog
 
+from app.database import SqlitePool
 from app.event_store.models import Event
 
 logger = structlog.get_logger()
 
+# Keeps IN (...) lists well under SQLite's bound-parameter limit.
+_ID_LOOKUP_CHUNK = 500
+
+# Idempotent retries resolve to a no-op insert instead of an IntegrityError.
+_SQL_INSERT_EVENT = """
+    INSERT INTO events (
+        event_id, aggregate_type, aggregate_id, event_type,
+        event_data, metadata, version, created_at, idempotency_key
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (idempotency_key) WHERE idempotency_key IS NOT NULL DO NOTHING
+"""
+
+# event_data is stored as a BLOB; the CAST also covers rows written as TEXT before that.
+_EVENT_COLUMNS = """
+    event_id, aggregate_type, aggregate_id, event_type,
+    CAST(event_data AS BLOB) AS event_data, metadata, version, created_at, idempotency_key
+"""
+
+_SQL_BY_AGGREGATE = f"""
+    SELECT {_EVENT_COLUMNS}
+    FROM events
+    WHERE aggregate_type = ? AND aggregate_id = ?
+    ORDER BY version ASC
+"""
+
+_SQL_RECENT_OF_TYPE = f"""
+    SELECT {_EVENT_COLUMNS}
+    FROM events
+    WHERE aggregate_type = ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+_SQL_RECENT = f"""
+    SELECT {_EVENT_COLUMNS}
+    FROM events
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+
+
+def _event_params(event: Event) -> tuple:
+    return (
+        event.event_id,
+        event.aggregate_type,
+        event.aggregate_id,
+        event.event_type,
+        event.event_data,
+        event.metadata,
+        event.version,
+        event.created_at,
+        event.idempotency_key,
+    )
+
+
+def _row_to_event(row: aiosqlite.Row) -> Event:
+    return Event(
+        event_id=row["event_id"],
+        aggregate_type=row["aggregate_type"],
+        aggregate_id=row["aggregate_id"],
+        event_type=sys.intern(row["event_type"]),
+        event_data=row["event_data"],
+        metadata=row["metadata"],
+        version=row["version"],
+        created_at=row["created_at"],
+        idempotency_key=row["idempotency_key"],
+    )
+
 
 class EventRepository:
-    def __init__(self, db: aiosqlite.Connection) -> None:
-        self._db = db
+    """Event log access.
 
-    async def append(self, event: Event) -> None:
-        await self._db.execute(
-            """
-            INSERT INTO events (
-                event_id, aggregate_type, aggregate_id, event_type,
-                event_data, metadata, version, created_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                event.event_id,
-                event.aggregate_type,
-                event.aggregate_id,
-                event.event_type,
-                event.event_data,
-                event.metadata,
-                event.version,
-                event.created_at,
-            ),
-        )
+    Appends, stored-id lookups and `get_latest_version` run on the pool's write
+    connection so they see the in-flight transaction; history queries use a
+    pooled read connection.
+    """
+
+    def __init__(self, pool: SqlitePool) -> None:
+        self._pool = pool
+
+    async def append(self, event: Event) -> bool:
+        """Insert an event; returns False if its idempotency key is already taken."""
+        cursor = await self._pool.write_conn.execute(_SQL_INSERT_EVENT, _event_params(event))
+        if cursor.rowcount == 0:
+            return False
         logger.info(
             "event_appended",
             event_id=event.event_id,
@@ -37,93 +101,52 @@ class EventRepository:
             event_type=event.event_type,
             version=event.version,
         )
+        return True
 
-    async def get_by_aggregate(self, aggregate_type: str, aggregate_id: str) -> list[Event]:
-        cursor = await self._db.execute(
-            """
-            SELECT event_id, aggregate_type, aggregate_id, event_type,
-                   event_data, metadata, version, created_at
-            FROM events
-            WHERE aggregate_type = ? AND aggregate_id = ?
-            ORDER BY version ASC
-            """,
-            (aggregate_type, aggregate_id),
+    async def append_many(self, events: list[Event]) -> int:
+        """Insert events in one statement; returns how many were not idempotency duplicates."""
+        cursor = await self._pool.write_conn.executemany(
+            _SQL_INSERT_EVENT, [_event_params(event) for event in events]
         )
-        rows = await cursor.fetchall()
-        return [
-            Event(
-                event_id=row["event_id"],
-                aggregate_type=row["aggregate_type"],
-                aggregate_id=row["aggregate_id"],
-                event_type=row["event_type"],
-                event_data=row["event_data"],
-                metadata=row["metadata"],
-                version=row["version"],
-                created_at=row["created_at"],
+        logger.info("events_appended", count=cursor.rowcount)
+        return cursor.rowcount
+
+    async def get_stored_event_ids(self, event_ids: list[str]) -> set[str]:
+        stored: set[str] = set()
+        for start in range(0, len(event_ids), _ID_LOOKUP_CHUNK):
+            chunk = event_ids[start : start + _ID_LOOKUP_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = await self._pool.write_conn.execute(
+                f"SELECT event_id FROM events WHERE event_id IN ({placeholders})", chunk
             )
-            for row in rows
-        ]
+            stored.update(row["event_id"] for row in await cursor.fetchall())
+        return stored
+
+    async def get_by_aggregate(self, aggregate_type: str, aggregate_id: str) -> list[Event]:
+        async with self._pool.read() as db:
+            cursor = await db.execute(_SQL_BY_AGGREGATE, (aggregate_type, aggregate_id))
+            rows = await cursor.fetchall()
+        return [_row_to_event(row) for row in rows]
 
     async def get_all(self, aggregate_type: str | None = None, limit: int = 100) -> list[Event]:
-        if aggregate_type is not None:
-            cursor = await self._db.execute(
-                """
-                SELECT event_id, aggregate_type, aggregate_id, event_type,
-                       event_data, metadata, version, created_at
-                FROM events
-                WHERE aggregate_type = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (aggregate_type, limit),
-            )
-        else:
-            cursor = await self._db.execute(
-                """
-                SELECT event_id, aggregate_type, aggregate_id, event_type,
-                       event_data, metadata, version, created_at
-                FROM events
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            )
-        rows = await cursor.fetchall()
-        return [
-            Event(
-                event_id=row["event_id"],
-                aggregate_type=row["aggregate_type"],
-                aggregate_id=row["aggregate_id"],
-                event_type=row["event_type"],
-                event_data=row["event_data"],
-                metadata=row["metadata"],
-                version=row["version"],
-                created_at=row["created_at"],
-            )
-            for row in rows
-        ]
+        async with self._pool.read() as db:
+            if aggregate_type is not None:
+                cursor = await db.execute(_SQL_RECENT_OF_TYPE, (aggregate_type, limit))
+            else:
+                cursor = await db.execute(_SQL_RECENT, (limit,))
+            rows = await cursor.fetchall()
+        return [_row_to_event(row) for row in rows]
 
     async def get_latest_version(self, aggregate_id: str) -> int:
-        cursor = await self._db.execute(
+        cursor = await self._pool.write_conn.execute(
             """
-            SELECT COALESCE(MAX(version), 0) AS latest_version
+            SELECT version
             FROM events
             WHERE aggregate_id = ?
+            ORDER BY version DESC
+            LIMIT 1
             """,
             (aggregate_id,),
         )
         row = await cursor.fetchone()
-        return row["latest_version"] if row else 0
-
-    async def check_idempotency(self, idempotency_key: str) -> bool:
-        cursor = await self._db.execute(
-            """
-            SELECT COUNT(*) AS cnt
-            FROM events
-            WHERE metadata IS NOT NULL
-              AND json_extract(metadata, '$.idempotency_key') = ?
-            """,
-            (idempotency_key,),
-        )
-        row = await cursor.fetchone()
-        return row["cnt"] > 0 if row else False
+        return row["version"] if row else 0
@@ -1,10 +1,12 @@
-import json
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
 from uuid import uuid4
 
 import aiosqlite
+import orjson
 import structlog
 
+from app.database import SqlitePool
 from app.event_store.models import Event
 from app.event_store.projections import ProjectionEngine
 from app.event_store.repository import EventRepository
@@ -14,10 +16,10 @@ logger = structlog.get_logger()
 
 
 class EventStoreService:
-    def __init__(self, db: aiosqlite.Connection) -> None:
-        self._db = db
-        self._repository = EventRepository(db)
-        self._projection_engine = ProjectionEngine(db)
+    def __init__(self, pool: SqlitePool) -> None:
+        self._pool = pool
+        self._repository = EventRepository(pool)
+        self._projection_engine = ProjectionEngine(pool.write_conn)
 
     async def append_event(
         self,
@@ -27,32 +29,47 @@ class EventStoreService:
         event_data: dict,
         metadata: dict | None = None,
         idempotency_key: str | None = None,
+        on_projected: Callable[[aiosqlite.Connection], Awaitable[None]] | None = None,
     ) -> Event:
+        """Store and project one event in a single write transaction.
+
+        `on_projected` runs inside that transaction after projection, so it can read the
+        projected state without racing other writers; raising from it rolls the event back.
+        """
         if idempotency_key is not None:
-            if await self._repository.check_idempotency(idempotency_key):
-                raise ConflictError(
-                    f"Event with idempotency key '{idempotency_key}' already exists"
-                )
             if metadata is None:
                 metadata = {}
             metadata["idempotency_key"] = idempotency_key
 
-        version = await self._repository.get_latest_version(aggregate_id) + 1
+        async with self._pool.transaction():
+            version = await self._repository.get_latest_version(aggregate_id) + 1
 
-        event = Event(
-            event_id=str(uuid4()),
-            aggregate_type=aggregate_type,
-            aggregate_id=aggregate_id,
-            event_type=event_type,
-            event_data=json.dumps(event_data),
-            metadata=json.dumps(metadata) if metadata else None,
-            version=version,
-            created_at=datetime.now(UTC).isoformat(),
-        )
+            event = Event(
+                event_id=str(uuid4()),
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                event_type=event_type,
+                event_data=orjson.dumps(event_data),
+                # metadata stays TEXT: json_extract would read a BLOB as JSONB.
+                metadata=orjson.dumps(metadata).decode() if metadata else None,
+                version=version,
+                created_at=datetime.now(UTC).isoformat(),
+                idempotency_key=idempotency_key,
+            )
 
-        await self._repository.append(event)
-        await self._projection_engine.project(event)
-        await self._db.commit()
+            if not await self._repository.append(event):
+                raise ConflictError(
+                    f"Event with idempotency key '{idempotency_key}' already exists"
+                )
+
+            try:
+                await self._projection_engine.project(event, event_data)
+                await self._projection_engine.flush()
+                if on_projected is not None:
+                    await on_projected(self._pool.write_conn)
+            except BaseException:
+                self._projection_engine.discard_pending()
+                raise
 
         logger.info(
             "event_stored_and_projected",
@@ -65,6 +82,70 @@ class EventStoreService:
 
         return event
 
+    async def append_events_bulk(
+        self,
+        aggregate_type: str,
+        event_type: str,
+        entries: list[tuple[str, dict, str | None]],
+    ) -> list[Event]:
+        """Append the first event of many new aggregates in one transaction.
+
+        `entries` are `(aggregate_id, event_data, idempotency_key)` tuples. Entries whose
+        key is already stored, or repeats earlier in the batch, are skipped; the stored
+        events are returned.
+        """
+        created_at = datetime.now(UTC).isoformat()
+        events = [
+            Event(
+                event_id=str(uuid4()),
+                aggregate_type=aggregate_type,
+                aggregate_id=aggregate_id,
+                event_type=event_type,
+                event_data=orjson.dumps(event_data),
+                metadata=orjson.dumps({"idempotency_key": key}).decode()
+                if key is not None
+                else None,
+                version=1,
+                created_at=created_at,
+                idempotency_key=key,
+            )
+            for aggregate_id, event_data, key in entries
+        ]
+        event_datas = [event_data for _, event_data, _ in entries]
+
+        async with self._pool.transaction():
+            inserted = await self._repository.append_many(events) if events else 0
+            if inserted < len(events):
+                # Some keys were duplicates; only project the events that were stored.
+                stored_ids = await self._repository.get_stored_event_ids(
+                    [event.event_id for event in events]
+                )
+                kept = [
+                    (event, event_data)
+                    for event, event_data in zip(events, event_datas, strict=True)
+                    if event.event_id in stored_ids
+                ]
+                events = [event for event, _ in kept]
+                event_datas = [event_data for _, event_data in kept]
+
+            try:
+                for event, event_data in zip(events, event_datas, strict=True):
+                    await self._projection_engine.project(event, event_data)
+                await self._projection_engine.flush()
+            except BaseException:
+                self._projection_engine.discard_pending()
+                raise
+
+        logger.info(
+            "events_bulk_stored_and_projected",
+            aggregate_type=aggregate_type,
+            event_type=event_type,
+            stored=len(events),
+            skipped=len(entries) - len(events),
+        )
+
+        return events
+
     async def get_events(
         self,
         aggregate_type: str | None = None,
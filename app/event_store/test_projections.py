@@ -0,0 +1,91 @@
+import orjson
+
+from app.event_store.models import Event
+from app.event_store.projections import ProjectionEngine
+
+
+def _event(event_type: str, aggregate_id: str, data: dict, version: int = 1) -> Event:
+    return Event(
+        event_id=f"{aggregate_id}-{version}",
+        aggregate_type="transaction",
+        aggregate_id=aggregate_id,
+        event_type=event_type,
+        event_data=orjson.dumps(data),
+        metadata=None,
+        version=version,
+        created_at="2026-03-05T00:00:00+00:00",
+    )
+
+
+def _created(aggregate_id: str, amount: float, date: str = "2026-03-05") -> Event:
+    return _event(
+        "transaction_created",
+        aggregate_id,
+        {"type": "expense", "amount": amount, "category": "food", "date": date},
+    )
+
+
+async def _summaries(pool) -> dict[str, tuple[float, int]]:
+    async with pool.read() as db:
+        cursor = await db.execute(
+            "SELECT year_month, total_expenses, transaction_count FROM monthly_summary_projection"
+        )
+        return {
+            row["year_month"]: (row["total_expenses"], row["transaction_count"])
+            for row in await cursor.fetchall()
+        }
+
+
+async def test_summary_deltas_are_buffered_until_flush(pool):
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(_created("t1", 10.0))
+        await engine.project(_created("t2", 5.5))
+
+        cursor = await pool.write_conn.execute("SELECT COUNT(*) FROM monthly_summary_projection")
+        assert (await cursor.fetchone())[0] == 0
+
+        await engine.flush()
+
+    assert await _summaries(pool) == {"2026-03": (15.5, 2)}
+
+
+async def test_update_within_same_month_adjusts_total_only(pool):
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(_created("t1", 10.0))
+        await engine.flush()
+
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(_event("transaction_updated", "t1", {"amount": 25.0}, version=2))
+        await engine.flush()
+
+    assert await _summaries(pool) == {"2026-03": (25.0, 1)}
+
+
+async def test_update_across_months_moves_the_transaction(pool):
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(_created("t1", 10.0))
+        await engine.project(_created("t2", 4.0))
+        await engine.flush()
+
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(
+            _event("transaction_updated", "t1", {"amount": 12.0, "date": "2026-04-01"}, 2)
+        )
+        await engine.flush()
+
+    assert await _summaries(pool) == {"2026-03": (4.0, 1), "2026-04": (12.0, 1)}
+
+
+async def test_discard_pending_drops_buffered_deltas(pool):
+    async with pool.transaction():
+        engine = ProjectionEngine(pool.write_conn)
+        await engine.project(_created("t1", 10.0))
+        engine.discard_pending()
+        await engine.flush()
+
+    assert await _summaries(pool) == {}
@@ -0,0 +1,65 @@
+from app.event_store.service import EventStoreService
+
+
+def _txn(amount: float) -> dict:
+    return {
+        "type": "expense",
+        "amount": amount,
+        "category": "food",
+        "description": None,
+        "date": "2026-03-05",
+        "currency": "EUR",
+    }
+
+
+async def _summary(pool) -> tuple[float, int] | None:
+    async with pool.read() as db:
+        cursor = await db.execute(
+            "SELECT total_expenses, transaction_count FROM monthly_summary_projection"
+        )
+        row = await cursor.fetchone()
+    return (row["total_expenses"], row["transaction_count"]) if row else None
+
+
+async def test_bulk_append_skips_duplicate_keys(pool):
+    store = EventStoreService(pool)
+    await store.append_event(
+        "transaction", "a0", "transaction_created", _txn(1.0), idempotency_key="k1"
+    )
+
+    events = await store.append_events_bulk(
+        "transaction",
+        "transaction_created",
+        [
+            ("a1", _txn(10.0), "k1"),  # already stored
+            ("a2", _txn(20.0), "k2"),
+            ("a3", _txn(30.0), "k2"),  # repeats earlier in the batch
+            ("a4", _txn(40.0), None),
+        ],
+    )
+
+    assert [e.aggregate_id for e in events] == ["a2", "a4"]
+    async with pool.read() as db:
+        cursor = await db.execute("SELECT id FROM transactions_projection ORDER BY id")
+        assert [row["id"] for row in await cursor.fetchall()] == ["a0", "a2", "a4"]
+    assert await _summary(pool) == (61.0, 3)
+
+    history = await store.get_events("transaction", "a2")
+    assert [e.idempotency_key for e in history] == ["k2"]
+    keys = {e.aggregate_id: e.idempotency_key for e in await store.get_events("transaction")}
+    assert keys == {"a0": "k1", "a2": "k2", "a4": None}
+
+
+async def test_bulk_append_of_only_duplicates_stores_nothing(pool):
+    store = EventStoreService(pool)
+    await store.append_event(
+        "transaction", "a0", "transaction_created", _txn(1.0), idempotency_key="k1"
+    )
+
+    events = await store.append_events_bulk(
+        "transaction", "transaction_created", [("a1", _txn(10.0), "k1")]
+    )
+
+    assert events == []
+    assert len(await store.get_events("transaction")) == 1
+    assert await _summary(pool) == (1.0, 1)
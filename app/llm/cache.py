@@ -0,0 +1,34 @@
+from langchain_anthropic import ChatAnthropic
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import SystemMessage
+
+from app.cache import AsyncTTLCache
+
+LLM_RESPONSE_TTL_SECONDS = 300
+
+# Parsed LLM JSON payloads, shared by every service instance in the process.
+sentiment_cache: AsyncTTLCache[dict] = AsyncTTLCache(maxsize=256, ttl=LLM_RESPONSE_TTL_SECONDS)
+recommendation_cache: AsyncTTLCache[dict] = AsyncTTLCache(
+    maxsize=1024, ttl=LLM_RESPONSE_TTL_SECONDS
+)
+
+
+def recommendation_key(ticker: str, price: float, trend: str, risk_tolerance: str) -> tuple:
+    """Bucket recommendation inputs so near-identical requests share a cache entry.
+
+    Price is kept to three significant figures, which is below the precision
+    the model reasons at anyway.
+    """
+    return (ticker, f"{price:.3g}", trend, risk_tolerance)
+
+
+def cacheable_system_prompt(llm: BaseChatModel, text: str) -> SystemMessage:
+    """Wrap a static instruction as a system prefix the provider can serve from its prompt cache.
+
+    Anthropic needs an explicit `cache_control` marker; OpenAI caches long
+    stable prefixes automatically, so the block is left plain there.
+    """
+    block: dict[str, object] = {"type": "text", "text": text}
+    if isinstance(llm, ChatAnthropic):
+        block["cache_control"] = {"type": "ephemeral"}
+    return SystemMessage(content=[block])
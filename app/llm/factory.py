@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+import httpx
 from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
@@ -6,6 +9,28 @@ from app.config import settings
 from app.exceptions import AppError
 from app.llm.config import LLMProvider
 
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_HTTP_TIMEOUT = 60.0
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client used by the chat models."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and drop the chat models bound to it."""
+    global _http_client
+    _build_cached.cache_clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class LLMFactory:
     @staticmethod
@@ -14,21 +39,43 @@ class LLMFactory:
         model: str | None = None,
         **kwargs: object,
     ) -> BaseChatModel:
+        """Return a chat model, reusing the instance built for identical arguments.
+
+        Chat models are safe to share, and reusing one keeps its HTTP client
+        and connection pool warm. Calls with unhashable kwargs are not cached.
+        """
         provider = provider or settings.llm_provider
         model = model or settings.llm_model
 
-        match provider:
-            case LLMProvider.OPENAI:
-                api_key = settings.openai_api_key
-                if not api_key:
-                    raise AppError("OpenAI API key is not configured", code="LLM_CONFIG_ERROR")
-                return ChatOpenAI(model=model, api_key=api_key, **kwargs)  # type: ignore[arg-type]
-
-            case LLMProvider.ANTHROPIC:
-                api_key = settings.anthropic_api_key
-                if not api_key:
-                    raise AppError("Anthropic API key is not configured", code="LLM_CONFIG_ERROR")
-                return ChatAnthropic(model=model, api_key=api_key, **kwargs)  # type: ignore[arg-type]
-
-            case _:
-                raise AppError(f"Unknown LLM provider: '{provider}'", code="LLM_CONFIG_ERROR")
+        try:
+            frozen_kwargs = frozenset(kwargs.items())
+        except TypeError:
+            return _build(provider, model, kwargs)
+        return _build_cached(provider, model, frozen_kwargs)
+
+
+@lru_cache(maxsize=16)
+def _build_cached(
+    provider: str, model: str, frozen_kwargs: frozenset[tuple[str, object]]
+) -> BaseChatModel:
+    return _build(provider, model, dict(frozen_kwargs))
+
+
+def _build(provider: str, model: str, kwargs: dict[str, object]) -> BaseChatModel:
+    match provider:
+        case LLMProvider.OPENAI:
+            api_key = settings.openai_api_key
+            if not api_key:
+                raise AppError("OpenAI API key is not configured", code="LLM_CONFIG_ERROR")
+            kwargs.setdefault("http_async_client", get_http_client())
+            return ChatOpenAI(model=model, api_key=api_key, **kwargs)  # type: ignore[arg-type]
+
+        case LLMProvider.ANTHROPIC:
+            # ChatAnthropic already shares one cached httpx client per base URL.
+            api_key = settings.anthropic_api_key
+            if not api_key:
+                raise AppError("Anthropic API key is not configured", code="LLM_CONFIG_ERROR")
+            return ChatAnthropic(model=model, api_key=api_key, **kwargs)  # type: ignore[arg-type]
+
+        case _:
+            raise AppError(f"Unknown LLM provider: '{provider}'", code="LLM_CONFIG_ERROR")
@@ -0,0 +1,56 @@
+import json
+import re
+from itertools import islice
+from typing import Any
+
+import orjson
+
+# An opening fence starts a line, or ends one after prose (e.g. "[Note] ```json").
+# A fence in a JSON string value does neither, since JSON strings cannot hold a raw newline.
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|```(?:json)?[ \t]*\n\s*", re.MULTILINE)
+_JSON_START_RE = re.compile(r"[{\[]")
+_DECODER = json.JSONDecoder()
+
+# Brackets tried by the prose fallback; each failed attempt can scan the rest of the text.
+_MAX_DECODE_ATTEMPTS = 3
+
+
+def extract_fenced_json(text: str) -> str:
+    """Return the body of the first markdown code block, or the stripped text if none."""
+    cleaned = text.strip()
+    match = _FENCE_RE.search(cleaned)
+    if match:
+        start = match.end()
+        end = cleaned.find("\n```", start)
+        if end == -1:
+            end = cleaned.find("```", start)
+        cleaned = cleaned[start : end if end != -1 else None].strip()
+    return cleaned
+
+
+def parse_llm_json(text: str) -> Any:
+    """Parse JSON from an LLM response, stripping markdown code block markers if present.
+
+    Falls back to decoding from the first few `{` or `[` in turn when the model wraps
+    the payload in prose. Errors are raised as `json.JSONDecodeError` (orjson's is a
+    subclass).
+    """
+    stripped = text.strip()
+    if stripped[:1] in ("{", "["):
+        # Bare JSON is the common case; skip the fence scan entirely.
+        try:
+            return orjson.loads(stripped)
+        except orjson.JSONDecodeError:
+            pass
+
+    payload = extract_fenced_json(stripped)
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as exc:
+        error = exc
+    for start in islice(_JSON_START_RE.finditer(payload), _MAX_DECODE_ATTEMPTS):
+        try:
+            return _DECODER.raw_decode(payload, start.start())[0]
+        except json.JSONDecodeError:
+            continue
+    raise error
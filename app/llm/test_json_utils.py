@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+from app.llm import json_utils
+from app.llm.json_utils import extract_fenced_json, parse_llm_json
+
+
+def test_bare_json_is_parsed_directly():
+    assert parse_llm_json(' {"a": 1} ') == {"a": 1}
+    assert parse_llm_json("[1, 2]") == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '```json\n{"a": 1}\n```',
+        '```\n{"a": 1}\n```',
+        'Here you go:\n```json\n{"a": 1}\n```\nAnything else?',
+        '[Note] ```json\n{"a": 1}\n```',
+    ],
+)
+def test_fenced_json_is_unwrapped(text):
+    assert parse_llm_json(text) == {"a": 1}
+
+
+def test_backticks_inside_string_values_are_kept():
+    assert parse_llm_json('```json\n{"code": "run ```x``` now"}\n```') == {
+        "code": "run ```x``` now"
+    }
+
+
+def test_fence_inside_a_string_value_is_not_an_opening_fence():
+    text = '{"code": "run ```x``` now"} trailing prose'
+
+    assert extract_fenced_json(text) == text
+    assert parse_llm_json(text) == {"code": "run ```x``` now"}
+
+
+def test_json_after_prose_is_decoded():
+    assert parse_llm_json('Sure! [Note] the result is {"a": [1, 2]} as requested') == {"a": [1, 2]}
+
+
+def test_invalid_output_raises_json_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        parse_llm_json("no json here")
+    with pytest.raises(json.JSONDecodeError):
+        parse_llm_json('{"a": [1, 2')
+
+
+def test_prose_fallback_gives_up_after_a_few_brackets(monkeypatch):
+    attempts = 0
+    raw_decode = json_utils._DECODER.raw_decode
+
+    def counting_raw_decode(s, idx=0):
+        nonlocal attempts
+        attempts += 1
+        return raw_decode(s, idx)
+
+    monkeypatch.setattr(json_utils._DECODER, "raw_decode", counting_raw_decode)
+
+    with pytest.raises(json.JSONDecodeError):
+        parse_llm_json("Truncated: " + '{"a": 1, ' * 2_000)
+
+    assert attempts == json_utils._MAX_DECODE_ATTEMPTS
@@ -10,6 +10,7 @@ from app.config import settings
 from app.context.router import router as context_router
 from app.database import close_database, init_database
 from app.exception_handlers import register_exception_handlers
+from app.llm.factory import close_http_client
 from app.logging_config import setup_logging
 from app.market.router import router as market_router
 from app.sentiment.router import router as sentiment_router
@@ -22,6 +23,7 @@ async def lifespan(app: FastAPI):
     setup_logging()
     await init_database()
     yield
+    await close_http_client()
     await close_database()
 
 
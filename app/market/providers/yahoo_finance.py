@@ -1,15 +1,24 @@
 import asyncio
 from datetime import UTC, datetime
 
+import numpy as np
 import structlog
 import yfinance as yf
 
+from app.cache import AsyncTTLCache
 from app.exceptions import AppError, NotFoundError
 from app.market.providers.base import MarketDataProvider
 from app.market.schemas import MarketAnalysis, StockQuote
 
 logger = structlog.get_logger()
 
+_RSI_PERIOD = 14
+_RSI_HISTORY_PERIOD = "3mo"
+
+# Shared across provider instances; quotes go stale fast, daily history does not.
+_info_cache: AsyncTTLCache[dict] = AsyncTTLCache(maxsize=1024, ttl=30)
+_history_cache: AsyncTTLCache[dict[str, np.ndarray]] = AsyncTTLCache(maxsize=1024, ttl=900)
+
 
 def _fetch_ticker_info(ticker: str) -> dict:
     """Fetch ticker info synchronously (to be run in a thread)."""
@@ -26,19 +35,39 @@ def _fetch_ticker_info(ticker: str) -> dict:
     return info
 
 
-def _fetch_ticker_history(ticker: str, period: str = "1y") -> list[dict]:
-    """Fetch ticker price history synchronously (to be run in a thread)."""
+def _fetch_ticker_history(ticker: str, period: str = "1y") -> dict[str, np.ndarray]:
+    """Fetch ticker price history synchronously (to be run in a thread).
+
+    Returns the OHLCV columns as NumPy arrays keyed by lower-case name.
+    """
     t = yf.Ticker(ticker)
     hist = t.history(period=period)
     if hist.empty:
         raise NotFoundError("Ticker", ticker)
-    return hist.reset_index().to_dict("records")
+    return {
+        "close": hist["Close"].to_numpy(),
+        "high": hist["High"].to_numpy(),
+        "low": hist["Low"].to_numpy(),
+        "volume": hist["Volume"].to_numpy(),
+    }
+
+
+async def _get_ticker_info(ticker: str) -> dict:
+    return await _info_cache.get_or_load(
+        ticker, lambda: asyncio.to_thread(_fetch_ticker_info, ticker)
+    )
+
+
+async def _get_ticker_history(ticker: str, period: str) -> dict[str, np.ndarray]:
+    return await _history_cache.get_or_load(
+        (ticker, period), lambda: asyncio.to_thread(_fetch_ticker_history, ticker, period)
+    )
 
 
 class YahooFinanceProvider(MarketDataProvider):
     async def get_quote(self, ticker: str) -> StockQuote:
         try:
-            info = await asyncio.to_thread(_fetch_ticker_info, ticker)
+            info = await _get_ticker_info(ticker)
         except NotFoundError:
             raise
         except Exception as exc:
@@ -65,7 +94,10 @@ class YahooFinanceProvider(MarketDataProvider):
 
     async def get_analysis(self, ticker: str) -> MarketAnalysis:
         try:
-            info = await asyncio.to_thread(_fetch_ticker_info, ticker)
+            info, history = await asyncio.gather(
+                _get_ticker_info(ticker),
+                _get_ticker_history(ticker, _RSI_HISTORY_PERIOD),
+            )
         except NotFoundError:
             raise
         except Exception as exc:
@@ -78,7 +110,7 @@ class YahooFinanceProvider(MarketDataProvider):
         week_52_high = info.get("fiftyTwoWeekHigh", 0.0)
         week_52_low = info.get("fiftyTwoWeekLow", 0.0)
 
-        rsi_signal = _compute_rsi_signal(price, fifty_day, two_hundred_day)
+        rsi_signal = _compute_rsi_signal(history["close"])
         trend = _compute_trend(price, fifty_day, two_hundred_day)
         summary = _build_analysis_summary(ticker, price, trend, rsi_signal, fifty_day)
 
@@ -95,17 +127,19 @@ class YahooFinanceProvider(MarketDataProvider):
         )
 
 
-def _compute_rsi_signal(price: float, fifty_day: float, two_hundred_day: float) -> str:
-    """Compute a simplified RSI-like signal from price vs moving averages."""
-    if not fifty_day or not two_hundred_day:
-        return "neutral"
-    avg = (fifty_day + two_hundred_day) / 2
-    if not avg:
+def _compute_rsi_signal(closes: np.ndarray) -> str:
+    """Compute a 14-day RSI signal from daily closing prices."""
+    if len(closes) <= _RSI_PERIOD:
         return "neutral"
-    deviation = (price - avg) / avg
-    if deviation < -0.1:
+    changes = np.diff(closes[-(_RSI_PERIOD + 1) :])
+    gains = float(np.where(changes > 0, changes, 0.0).sum())
+    losses = float(np.where(changes < 0, -changes, 0.0).sum())
+    if not losses:
+        return "overbought" if gains else "neutral"
+    rsi = 100 - 100 / (1 + gains / losses)
+    if rsi < 30:
         return "oversold"
-    if deviation > 0.1:
+    if rsi > 70:
         return "overbought"
     return "neutral"
 
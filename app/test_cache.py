@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.cache import AsyncTTLCache
+
+
+async def test_entries_expire_after_ttl():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=4, ttl=0.01)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    await asyncio.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert await cache.get_or_load("a", lambda: asyncio.sleep(0, result=2)) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+async def test_concurrent_misses_share_one_load():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=4, ttl=60)
+    calls = 0
+
+    async def load() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return 7
+
+    assert await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(3))) == [7, 7, 7]
+    assert calls == 1
+
+
+async def test_failed_load_is_not_cached():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=4, ttl=60)
+
+    async def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("k", fail)
+    assert await cache.get_or_load("k", lambda: asyncio.sleep(0, result=1)) == 1
+
+
+async def test_get_or_load_many_loads_only_misses_in_one_call():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=8, ttl=60)
+    cache.set("a", 1)
+    batches: list[list[str]] = []
+
+    async def load(keys: list[str]) -> dict[str, int]:
+        batches.append(keys)
+        await asyncio.sleep(0)
+        # "c" fails to load and is left out of the result.
+        return {key: ord(key) for key in keys if key != "c"}
+
+    first, second = await asyncio.gather(
+        cache.get_or_load_many(["a", "b", "c", "b"], load),
+        cache.get_or_load_many(["b"], load),
+    )
+
+    assert batches == [["b", "c"]]
+    assert first == {"a": 1, "b": ord("b")}
+    assert second == {"b": ord("b")}
+    assert cache.get("b") == ord("b")
+    assert cache.get("c") is None
+
+
+async def test_get_or_load_many_recovers_from_a_failing_loader():
+    cache: AsyncTTLCache[int] = AsyncTTLCache(maxsize=8, ttl=60)
+
+    def raise_on_call(keys: list[str]):
+        raise RuntimeError("loader broke")
+
+    async def raise_when_awaited(keys: list[str]) -> dict[str, int]:
+        raise RuntimeError("loader broke")
+
+    async def load(keys: list[str]) -> dict[str, int]:
+        return dict.fromkeys(keys, 1)
+
+    # A key left in flight by a failed load would make these calls wait forever.
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load_many(["a"], raise_on_call)
+    assert await asyncio.wait_for(cache.get_or_load_many(["a"], raise_when_awaited), 1) == {}
+    assert await asyncio.wait_for(cache.get_or_load_many(["a"], load), 1) == {"a": 1}
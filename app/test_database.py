@@ -0,0 +1,152 @@
+import sqlite3
+
+import aiosqlite
+import orjson
+import pytest
+
+from app.database import close_database, get_pool, init_database
+from app.event_store.service import EventStoreService
+from app.exceptions import ConflictError
+
+# The events table as created before idempotency keys had their own column.
+_LEGACY_EVENTS_TABLE = """
+    CREATE TABLE events (
+        event_id TEXT PRIMARY KEY,
+        aggregate_type TEXT NOT NULL,
+        aggregate_id TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        event_data TEXT NOT NULL,
+        metadata TEXT,
+        version INTEGER NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        UNIQUE(aggregate_id, version)
+    )
+"""
+
+_LEGACY_IDEMPOTENCY_INDEX = """
+    CREATE UNIQUE INDEX idx_events_idempotency
+    ON events(json_extract(metadata, '$.idempotency_key'))
+    WHERE json_extract(metadata, '$.idempotency_key') IS NOT NULL
+"""
+
+
+async def _create_legacy_database(path: str, *, with_index: bool) -> None:
+    async with aiosqlite.connect(path) as conn:
+        await conn.execute(_LEGACY_EVENTS_TABLE)
+        if with_index:
+            await conn.execute(_LEGACY_IDEMPOTENCY_INDEX)
+        await conn.executemany(
+            """
+            INSERT INTO events (
+                event_id, aggregate_type, aggregate_id, event_type,
+                event_data, metadata, version, created_at
+            ) VALUES (?, 'transaction', ?, 'noop', '{}', ?, 1, '2026-01-01T00:00:00+00:00')
+            """,
+            [
+                ("e1", "a1", orjson.dumps({"idempotency_key": "k1"}).decode()),
+                ("e2", "a2", orjson.dumps({"idempotency_key": "k2"}).decode()),
+                ("e3", "a3", None),
+            ],
+        )
+        await conn.commit()
+
+
+async def _index_names(pool) -> set[str]:
+    async with pool.read() as db:
+        cursor = await db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        return {row["name"] for row in await cursor.fetchall()}
+
+
+@pytest.mark.parametrize("with_index", [False, True])
+async def test_migration_moves_idempotency_keys_into_column(db_path, with_index):
+    await _create_legacy_database(db_path, with_index=with_index)
+
+    await init_database()
+    try:
+        pool = get_pool()
+        async with pool.read() as db:
+            cursor = await db.execute("SELECT event_id, idempotency_key FROM events")
+            keys = {row["event_id"]: row["idempotency_key"] for row in await cursor.fetchall()}
+        assert keys == {"e1": "k1", "e2": "k2", "e3": None}
+
+        indexes = await _index_names(pool)
+        assert "idx_events_idempotency" not in indexes
+        assert "idx_events_idempotency_key" in indexes
+
+        store = EventStoreService(pool)
+        with pytest.raises(ConflictError):
+            await store.append_event("transaction", "a4", "noop", {}, idempotency_key="k1")
+        event = await store.append_event("transaction", "a5", "noop", {}, idempotency_key="k3")
+
+        history = await store.get_events("transaction", "a1")
+        assert history[0].idempotency_key == "k1"
+        assert history[0].event_data == b"{}"
+    finally:
+        await close_database()
+
+    # A second startup finds the column already in place and leaves the data alone.
+    await init_database()
+    try:
+        store = EventStoreService(get_pool())
+        events = await store.get_events("transaction")
+        assert {e.event_id: e.idempotency_key for e in events} == {
+            "e1": "k1",
+            "e2": "k2",
+            "e3": None,
+            event.event_id: "k3",
+        }
+    finally:
+        await close_database()
+
+
+async def test_fresh_database_has_idempotency_column(pool):
+    async with pool.read() as db:
+        cursor = await db.execute("PRAGMA table_info(events)")
+        columns = {row["name"] for row in await cursor.fetchall()}
+    assert "idempotency_key" in columns
+    assert "idx_events_idempotency_key" in await _index_names(pool)
+
+
+async def _budget_categories(pool) -> list[str]:
+    async with pool.read() as db:
+        cursor = await db.execute("SELECT category FROM budgets_projection ORDER BY category")
+        return [row["category"] for row in await cursor.fetchall()]
+
+
+async def _insert_budget(conn, category: str) -> None:
+    await conn.execute(
+        """
+        INSERT INTO budgets_projection (id, category, monthly_limit, created_at, updated_at)
+        VALUES (?, ?, 100, '2026-03-05', '2026-03-05')
+        """,
+        (category, category),
+    )
+
+
+async def test_transaction_rolls_back_when_the_body_raises(pool):
+    with pytest.raises(RuntimeError):
+        async with pool.transaction() as db:
+            await _insert_budget(db, "food")
+            raise RuntimeError("boom")
+
+    async with pool.transaction() as db:
+        await _insert_budget(db, "rent")
+
+    assert await _budget_categories(pool) == ["rent"]
+
+
+async def test_transaction_rolls_back_when_commit_fails(pool, monkeypatch):
+    async def failing_commit() -> None:
+        raise sqlite3.OperationalError("database is locked")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(pool.write_conn, "commit", failing_commit)
+        with pytest.raises(sqlite3.OperationalError):
+            async with pool.transaction() as db:
+                await _insert_budget(db, "food")
+
+    assert not pool.write_conn.in_transaction
+    async with pool.transaction() as db:
+        await _insert_budget(db, "rent")
+
+    assert await _budget_categories(pool) == ["rent"]
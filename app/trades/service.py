@@ -1,54 +1,28 @@
 import asyncio
 import json
-import re
 
 import structlog
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 
-from app.exceptions import AppError, ValidationError
+from app.exceptions import ValidationError
+from app.llm.cache import recommendation_cache, recommendation_key, sentiment_cache
+from app.llm.json_utils import parse_llm_json
 from app.market.schemas import MarketAnalysis, StockQuote
 from app.market.service import MarketService
-from app.sentiment.schemas import SentimentResult
-from app.sentiment.service import SentimentService
+from app.sentiment.service import build_sentiment_result
 from app.trades.schemas import TradeRecommendation
 
 logger = structlog.get_logger()
 
 _DEFAULT_TICKERS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA"]
 _MAX_TICKERS = 10
-
-_RECOMMENDATION_PROMPT = (
-    "Based on the following data for {ticker}, provide a trade recommendation:\n\n"
-    "Current Price: ${price}\n"
-    "52-Week High: ${high}, Low: ${low}\n"
-    "Trend: {trend}\n"
-    "Sentiment: {sentiment} (score: {score})\n"
-    "User Risk Tolerance: {risk_tolerance}\n\n"
-    "Provide recommendation as JSON with: action (buy/sell/hold/watch), "
-    "confidence (0-1), target_price, stop_loss, rationale, "
-    "risk_level (low/medium/high), time_horizon (short_term/medium_term/long_term)"
-)
-
-
-def _parse_llm_json(text: str) -> dict:
-    """Parse JSON from LLM response, stripping markdown code block markers if present."""
-    cleaned = text.strip()
-    match = re.search(r"```(?:json)?\s*(.*?)```", cleaned, re.DOTALL)
-    if match:
-        cleaned = match.group(1).strip()
-    return json.loads(cleaned)
+_MAX_CONCURRENCY = 5
 
 
 class TradeService:
-    def __init__(
-        self,
-        market_service: MarketService,
-        sentiment_service: SentimentService,
-        llm: BaseChatModel,
-    ) -> None:
+    def __init__(self, market_service: MarketService, llm: BaseChatModel) -> None:
         self._market = market_service
-        self._sentiment = sentiment_service
         self._llm = llm
 
     async def get_recommendations(
@@ -67,65 +41,119 @@ class TradeService:
 
         logger.info("trades_get_recommendations", tickers=tickers, risk_tolerance=risk_tolerance)
 
-        tasks = [self._get_recommendation_for_ticker(ticker, risk_tolerance) for ticker in tickers]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Repeated tickers share one market fetch and, via the cache key, one LLM prompt.
+        unique_tickers = list(dict.fromkeys(tickers))
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        fetched = await asyncio.gather(
+            *(self._fetch_market_data(ticker, semaphore) for ticker in unique_tickers),
+            return_exceptions=True,
+        )
+        market_by_ticker = dict(zip(unique_tickers, fetched, strict=True))
 
-        recommendations = []
-        for ticker, result in zip(tickers, results, strict=False):
+        planned: list[tuple[str, StockQuote, tuple]] = []
+        inputs: dict[tuple, tuple[str, StockQuote, MarketAnalysis]] = {}
+        for ticker in tickers:
+            result = market_by_ticker[ticker]
             if isinstance(result, Exception):
                 logger.warning("trade_recommendation_failed", ticker=ticker, error=str(result))
                 continue
-            recommendations.append(result)
+            analysis, quote = result
+            key = recommendation_key(ticker, quote.price, analysis.trend, risk_tolerance)
+            planned.append((ticker, quote, key))
+            inputs.setdefault(key, (ticker, quote, analysis))
+
+        # Cached keys are served directly; the rest share one batched prompt round, and
+        # keys another request is already loading are awaited instead of re-prompted.
+        llm_results = await recommendation_cache.get_or_load_many(
+            inputs,
+            lambda keys: self._run_llm_batch(
+                {key: self._combined_prompt(*inputs[key], risk_tolerance) for key in keys},
+                {key: inputs[key][1] for key in keys},
+            ),
+        )
 
+        recommendations: list[TradeRecommendation] = []
+        for ticker, quote, key in planned:
+            data = llm_results.get(key)
+            if data is None:
+                continue
+            try:
+                recommendations.append(self._build_recommendation(ticker, quote, data))
+            except (TypeError, ValueError) as exc:
+                logger.warning("trade_recommendation_failed", ticker=ticker, error=str(exc))
         return recommendations
 
-    async def _get_recommendation_for_ticker(
-        self, ticker: str, risk_tolerance: str
-    ) -> TradeRecommendation:
-        """Fetch market data and sentiment, then generate a recommendation."""
-        analysis, sentiment = await asyncio.gather(
-            self._market.get_analysis(ticker),
-            self._sentiment.analyze(ticker),
-        )
+    async def _fetch_market_data(
+        self, ticker: str, semaphore: asyncio.Semaphore
+    ) -> tuple[MarketAnalysis, StockQuote]:
+        async with semaphore:
+            return await asyncio.gather(
+                self._market.get_analysis(ticker),
+                self._market.get_quote(ticker),
+            )
 
-        quote = await self._market.get_quote(ticker)
-        return await self._generate_recommendation(
-            ticker, quote, analysis, sentiment, risk_tolerance
+    async def _run_llm_batch(
+        self, prompts: dict[tuple, str], quotes: dict[tuple, StockQuote]
+    ) -> dict[tuple, dict]:
+        """Send all combined prompts as one batch and return the usable recommendations.
+
+        Each reply is checked by building a recommendation from it, so a malformed
+        reply is logged and dropped (and never cached) without failing the others.
+        The sentiment half seeds the sentiment cache only if it validates too.
+        """
+        keys = list(prompts)
+        responses = await self._llm.abatch(
+            [[HumanMessage(content=prompts[key])] for key in keys],
+            config={"max_concurrency": _MAX_CONCURRENCY},
+            return_exceptions=True,
         )
 
-    async def _generate_recommendation(
-        self,
-        ticker: str,
-        quote: StockQuote,
-        analysis: MarketAnalysis,
-        sentiment: SentimentResult,
-        risk_tolerance: str,
-    ) -> TradeRecommendation:
-        """Use the LLM to synthesize a trade recommendation."""
-        prompt = _RECOMMENDATION_PROMPT.format(
-            ticker=ticker,
-            price=f"{quote.price:.2f}",
-            high=f"{analysis.week_52_high:.2f}",
-            low=f"{analysis.week_52_low:.2f}",
-            trend=analysis.trend,
-            sentiment=sentiment.overall_sentiment,
-            score=f"{sentiment.sentiment_score:.2f}",
-            risk_tolerance=risk_tolerance,
-        )
-
-        try:
-            response = await self._llm.ainvoke([HumanMessage(content=prompt)])
+        results: dict[tuple, dict] = {}
+        for key, response in zip(keys, responses, strict=True):
+            ticker = key[0]
+            if isinstance(response, Exception):
+                logger.error("trade_recommendation_llm_error", ticker=ticker, error=str(response))
+                continue
             content = (
                 response.content if isinstance(response.content, str) else str(response.content)
             )
-            data = _parse_llm_json(content)
-        except json.JSONDecodeError as exc:
-            logger.error("trade_recommendation_parse_error", ticker=ticker, error=str(exc))
-            raise AppError(f"Failed to parse recommendation for {ticker}") from exc
-        except Exception as exc:
-            logger.error("trade_recommendation_llm_error", ticker=ticker, error=str(exc))
-            raise AppError(f"Failed to generate recommendation for {ticker}: {exc}") from exc
+            try:
+                data = parse_llm_json(content)
+            except json.JSONDecodeError as exc:
+                logger.error("trade_recommendation_parse_error", ticker=ticker, error=str(exc))
+                continue
+            if not isinstance(data, dict):
+                logger.error(
+                    "trade_recommendation_parse_error", ticker=ticker, error="not an object"
+                )
+                continue
 
+            recommendation = data.get("recommendation", data)
+            if not isinstance(recommendation, dict):
+                logger.error(
+                    "trade_recommendation_parse_error", ticker=ticker, error="not an object"
+                )
+                continue
+            try:
+                self._build_recommendation(ticker, quotes[key], recommendation)
+            except (TypeError, ValueError) as exc:
+                logger.error("trade_recommendation_invalid", ticker=ticker, error=str(exc))
+                continue
+
+            sentiment = data.get("sentiment")
+            if sentiment is not None:
+                try:
+                    build_sentiment_result(ticker, sentiment)
+                except (TypeError, ValueError) as exc:
+                    # Only the sentiment half is unusable; the recommendation still stands.
+                    logger.warning("trade_sentiment_invalid", ticker=ticker, error=str(exc))
+                else:
+                    sentiment_cache.set(ticker, sentiment)
+            results[key] = recommendation
+        return results
+
+    @staticmethod
+    def _build_recommendation(ticker: str, quote: StockQuote, data: dict) -> TradeRecommendation:
         return TradeRecommendation(
             ticker=ticker,
             action=data.get("action", "hold"),
@@ -137,3 +165,22 @@ class TradeService:
             risk_level=data.get("risk_level", "medium"),
             time_horizon=data.get("time_horizon", "medium_term"),
         )
+
+    @staticmethod
+    def _combined_prompt(
+        ticker: str, quote: StockQuote, analysis: MarketAnalysis, risk_tolerance: str
+    ) -> str:
+        return (
+            f"Based on the following data for {ticker}, assess the current market sentiment "
+            "and provide a trade recommendation:\n\n"
+            f"Current Price: ${quote.price:.2f}\n"
+            f"52-Week High: ${analysis.week_52_high:.2f}, Low: ${analysis.week_52_low:.2f}\n"
+            f"Trend: {analysis.trend}\n"
+            f"User Risk Tolerance: {risk_tolerance}\n\n"
+            "Return as JSON with two keys:\n"
+            '"sentiment": overall_sentiment (positive/negative/neutral), '
+            "sentiment_score (-1.0 to 1.0), factors (list of strings), summary\n"
+            '"recommendation": action (buy/sell/hold/watch), confidence (0-1), '
+            "target_price, stop_loss, rationale, risk_level (low/medium/high), "
+            "time_horizon (short_term/medium_term/long_term)"
+        )
@@ -0,0 +1,126 @@
+import orjson
+import pytest
+from langchain_core.messages import AIMessage
+
+from app.llm.cache import recommendation_cache, sentiment_cache
+from app.market.schemas import MarketAnalysis, StockQuote
+from app.sentiment.service import SentimentService
+from app.trades.service import TradeService
+
+_SENTIMENT = {
+    "overall_sentiment": "positive",
+    "sentiment_score": 0.6,
+    "factors": ["earnings beat"],
+    "summary": "Upbeat.",
+}
+_RECOMMENDATION = {
+    "action": "buy",
+    "confidence": 0.8,
+    "target_price": 120.0,
+    "stop_loss": 90.0,
+    "rationale": "Momentum.",
+    "risk_level": "medium",
+    "time_horizon": "short_term",
+}
+
+
+class _FakeMarket:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def get_quote(self, ticker: str) -> StockQuote:
+        self.calls.append(ticker)
+        return StockQuote(
+            ticker=ticker,
+            price=100.0,
+            change=1.0,
+            change_percent=1.0,
+            high=101.0,
+            low=99.0,
+            volume=1_000,
+            timestamp="2026-03-05T00:00:00+00:00",
+        )
+
+    async def get_analysis(self, ticker: str) -> MarketAnalysis:
+        return MarketAnalysis(
+            ticker=ticker,
+            current_price=100.0,
+            fifty_day_avg=95.0,
+            two_hundred_day_avg=90.0,
+            week_52_high=130.0,
+            week_52_low=70.0,
+            rsi_signal="neutral",
+            trend="bullish",
+            summary="",
+        )
+
+
+class _FakeLLM:
+    """Answers each combined prompt with the reply configured for its ticker."""
+
+    def __init__(self, replies: dict[str, object]) -> None:
+        self._replies = replies
+        self.batches: list[int] = []
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        self.batches.append(len(inputs))
+        replies = []
+        for messages in inputs:
+            ticker = messages[0].content.split(" for ", 1)[1].split(",", 1)[0]
+            reply = self._replies[ticker]
+            replies.append(AIMessage(content=orjson.dumps(reply).decode()))
+        return replies
+
+    async def ainvoke(self, messages):
+        raise AssertionError("sentiment should be served from the cache")
+
+
+@pytest.fixture(autouse=True)
+def _clear_llm_caches():
+    recommendation_cache.clear()
+    sentiment_cache.clear()
+    yield
+    recommendation_cache.clear()
+    sentiment_cache.clear()
+
+
+async def test_recommendations_are_batched_and_seed_the_sentiment_cache():
+    market = _FakeMarket()
+    reply = {"sentiment": _SENTIMENT, "recommendation": _RECOMMENDATION}
+    llm = _FakeLLM({"AAPL": reply, "MSFT": reply})
+    service = TradeService(market, llm)
+
+    recommendations = await service.get_recommendations(["aapl", "MSFT", "AAPL"])
+
+    assert [r.ticker for r in recommendations] == ["AAPL", "MSFT", "AAPL"]
+    assert llm.batches == [2]
+    assert sorted(market.calls) == ["AAPL", "MSFT"]
+
+    # A repeat request is answered from the recommendation cache.
+    await service.get_recommendations(["AAPL"])
+    assert llm.batches == [2]
+
+    result = await SentimentService(llm).analyze("AAPL")
+    assert result.sentiment_score == 0.6
+
+
+async def test_malformed_replies_are_dropped_per_ticker():
+    llm = _FakeLLM(
+        {
+            "AAPL": {"sentiment": _SENTIMENT, "recommendation": _RECOMMENDATION},
+            "MSFT": {"recommendation": {**_RECOMMENDATION, "confidence": "high"}},
+            "TSLA": {
+                "sentiment": {**_SENTIMENT, "sentiment_score": "very"},
+                "recommendation": _RECOMMENDATION,
+            },
+        }
+    )
+
+    recommendations = await TradeService(_FakeMarket(), llm).get_recommendations(
+        ["AAPL", "MSFT", "TSLA"]
+    )
+
+    assert [r.ticker for r in recommendations] == ["AAPL", "TSLA"]
+    # The invalid sentiment half is not cached, so analyze() goes to the LLM itself.
+    assert sentiment_cache.get("TSLA") is None
+    assert sentiment_cache.get("AAPL") == _SENTIMENT
@@ -0,0 +1,14 @@
+from app.cache import AsyncTTLCache
+
+# Upper bound on staleness for results that depend on the current date.
+SUMMARY_TTL_SECONDS = 60
+
+# Read models derived from the transaction projections, shared by every service
+# instance in the process. Any transaction write clears both.
+summary_cache: AsyncTTLCache[list] = AsyncTTLCache(maxsize=64, ttl=SUMMARY_TTL_SECONDS)
+savings_rate_cache: AsyncTTLCache[dict] = AsyncTTLCache(maxsize=16, ttl=SUMMARY_TTL_SECONDS)
+
+
+def invalidate_transaction_caches() -> None:
+    summary_cache.clear()
+    savings_rate_cache.clear()
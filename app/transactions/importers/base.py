@@ -13,7 +13,25 @@ class ImporterBase(ABC):
         ...
 
     @staticmethod
-    def generate_idempotency_key(date: str, amount: float, description: str | None) -> str:
-        """Generate deterministic hash for deduplication."""
+    def generate_idempotency_key(
+        date: str, amount: float, description: str | None, occurrence: int = 0
+    ) -> str:
+        """Generate deterministic hash for deduplication.
+
+        `occurrence` numbers identical rows within one file, so two equal purchases on
+        one statement keep distinct keys; the first occurrence hashes as it always has.
+        """
         raw = f"{date}|{amount}|{description or ''}"
-        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+        if occurrence:
+            raw = f"{raw}|{occurrence}"
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    @classmethod
+    def next_idempotency_key(
+        cls, seen: dict[tuple, int], date: str, amount: float, description: str | None
+    ) -> str:
+        """Key for the next row of a file, counting earlier identical rows in `seen`."""
+        identity = (date, amount, description)
+        occurrence = seen.get(identity, 0)
+        seen[identity] = occurrence + 1
+        return cls.generate_idempotency_key(date, amount, description, occurrence)
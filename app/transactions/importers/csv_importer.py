@@ -1,12 +1,19 @@
+import asyncio
 import csv
 import io
-import re
-from datetime import datetime
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import BinaryIO
 
 import structlog
 
 from app.transactions.importers.base import ImporterBase
-from app.transactions.models import Category, TransactionType
+from app.transactions.models import (
+    CATEGORY_BY_VALUE,
+    TRANSACTION_TYPE_BY_VALUE,
+    Category,
+    TransactionType,
+)
 from app.transactions.schemas import TransactionCreate
 
 logger = structlog.get_logger()
@@ -24,30 +31,66 @@ DATE_FORMATS = [
     "%d.%m.%Y",
 ]
 
-VALID_CATEGORIES = {c.value for c in Category}
+# Deletes every ASCII character except digits, separators and signs.
+_AMOUNT_CHARS = "0123456789.,-+"
+_AMOUNT_TRANSLATE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if chr(c) not in _AMOUNT_CHARS)
+)
 
 
 class CSVImporter(ImporterBase):
     async def parse(
-        self, file_content: bytes, filename: str
+        self, file_content: bytes | BinaryIO, filename: str
     ) -> tuple[list[TransactionCreate], list[str]]:
-        """Parse CSV file content and return transactions with idempotency keys."""
-        text = self._decode_content(file_content)
-        reader = csv.DictReader(io.StringIO(text))
+        """Parse CSV content and return transactions with idempotency keys.
 
-        if reader.fieldnames is None:
+        Accepts raw bytes or a seekable binary file, such as an upload's spooled
+        temp file, which is read row by row rather than loaded whole. Parsing runs
+        in a worker thread since a large upload is read from disk.
+        """
+        source = io.BytesIO(file_content) if isinstance(file_content, bytes) else file_content
+        return await asyncio.to_thread(self._parse_source, source, filename)
+
+    def _parse_source(
+        self, source: BinaryIO, filename: str
+    ) -> tuple[list[TransactionCreate], list[str]]:
+        try:
+            return self._parse_stream(source, filename, "utf-8")
+        except UnicodeDecodeError:
+            source.seek(0)
+            return self._parse_stream(source, filename, "latin-1")
+
+    def _parse_stream(
+        self, source: BinaryIO, filename: str, encoding: str
+    ) -> tuple[list[TransactionCreate], list[str]]:
+        """Decode and tokenize the file incrementally instead of materializing it as one str."""
+        stream = io.TextIOWrapper(source, encoding=encoding, newline="")
+        try:
+            return self._parse_rows(csv.reader(stream), filename)
+        finally:
+            # Hand the file back unclosed; the caller owns it.
+            stream.detach()
+
+    def _parse_rows(
+        self, reader: Iterator[list[str]], filename: str
+    ) -> tuple[list[TransactionCreate], list[str]]:
+        header = next(reader, None)
+        if header is None:
             logger.warning("csv_no_headers", filename=filename)
             return [], []
 
-        column_map = self._detect_columns(reader.fieldnames)
+        column_map = self._detect_columns(header)
         logger.info("csv_columns_detected", filename=filename, mapping=column_map)
 
         transactions: list[TransactionCreate] = []
         idempotency_keys: list[str] = []
+        seen: dict[tuple, int] = {}
+        # Rows in one statement share a date format; the last one that worked moves first.
+        date_formats = list(DATE_FORMATS)
 
-        for row_num, row in enumerate(reader, start=2):
+        for row_num, row in enumerate(filter(None, reader), start=2):
             try:
-                txn, key = self._parse_row(row, column_map, row_num)
+                txn, key = self._parse_row(row, column_map, row_num, seen, date_formats)
                 transactions.append(txn)
                 idempotency_keys.append(key)
             except (ValueError, KeyError) as exc:
@@ -55,32 +98,30 @@ class CSVImporter(ImporterBase):
 
         return transactions, idempotency_keys
 
-    def _decode_content(self, file_content: bytes) -> str:
-        """Decode bytes to string with encoding fallback."""
-        try:
-            return file_content.decode("utf-8")
-        except UnicodeDecodeError:
-            return file_content.decode("latin-1")
-
-    def _detect_columns(self, fieldnames: list[str]) -> dict[str, str]:
-        """Auto-detect column mapping from CSV headers."""
-        mapping: dict[str, str] = {}
-        for field in fieldnames:
+    def _detect_columns(self, fieldnames: list[str]) -> dict[str, int]:
+        """Auto-detect column indices from CSV headers."""
+        mapping: dict[str, int] = {}
+        for index, field in enumerate(fieldnames):
             normalized = field.strip().lower()
             if normalized in DATE_HEADERS:
-                mapping["date"] = field
+                mapping["date"] = index
             elif normalized in AMOUNT_HEADERS:
-                mapping["amount"] = field
+                mapping["amount"] = index
             elif normalized in DESCRIPTION_HEADERS:
-                mapping["description"] = field
+                mapping["description"] = index
             elif normalized in CATEGORY_HEADERS:
-                mapping["category"] = field
+                mapping["category"] = index
             elif normalized in TYPE_HEADERS:
-                mapping["type"] = field
+                mapping["type"] = index
         return mapping
 
     def _parse_row(
-        self, row: dict[str, str], column_map: dict[str, str], row_num: int
+        self,
+        row: list[str],
+        column_map: dict[str, int],
+        row_num: int,
+        seen: dict[tuple, int],
+        date_formats: list[str],
     ) -> tuple[TransactionCreate, str]:
         """Parse a single CSV row into a TransactionCreate and idempotency key."""
         date_raw = self._get_field(row, column_map, "date", required=True)
@@ -89,11 +130,10 @@ class CSVImporter(ImporterBase):
         if not date_raw or not amount_raw:
             raise ValueError(f"Row {row_num}: missing date or amount")
 
-        date_str = self._normalize_date(date_raw.strip())
-        amount_val = self._parse_amount(amount_raw.strip())
-
+        # _get_field strips every cell, so values below are used as-is.
+        date_str = self._normalize_date(date_raw, date_formats)
+        amount_val = self._parse_amount(amount_raw)
         description = self._get_field(row, column_map, "description")
-        description = description.strip() if description else None
 
         category = self._resolve_category(self._get_field(row, column_map, "category"))
         txn_type = self._resolve_type(self._get_field(row, column_map, "type"), amount_val)
@@ -106,35 +146,48 @@ class CSVImporter(ImporterBase):
             date=date_str,
         )
 
-        key = self.generate_idempotency_key(date_str, abs(amount_val), description)
+        key = self.next_idempotency_key(seen, date_str, abs(amount_val), description)
         return txn, key
 
     def _get_field(
-        self, row: dict[str, str], column_map: dict[str, str], field: str, *, required: bool = False
+        self, row: list[str], column_map: dict[str, int], field: str, *, required: bool = False
     ) -> str | None:
-        """Get field value from row using column mapping."""
-        col_name = column_map.get(field)
-        if col_name is None:
+        """Get the stripped field value from row using column mapping."""
+        index = column_map.get(field)
+        if index is None:
             if required:
                 raise ValueError(f"Required column '{field}' not found in headers")
             return None
-        value = row.get(col_name, "").strip()
+        value = row[index].strip() if index < len(row) else ""
         if not value and required:
             raise ValueError(f"Empty value for required column '{field}'")
         return value if value else None
 
-    def _normalize_date(self, date_str: str) -> str:
-        """Try multiple date formats and return YYYY-MM-DD."""
-        for fmt in DATE_FORMATS:
+    def _normalize_date(self, date_str: str, formats: list[str]) -> str:
+        """Try multiple date formats and return YYYY-MM-DD.
+
+        `formats` is the parse's own ordering; a format that matches after the first
+        is moved to the front for the following rows.
+        """
+        if len(date_str) == 10 and date_str[4] == "-" and date_str[7] == "-":
+            try:
+                return date.fromisoformat(date_str).isoformat()
+            except ValueError:
+                pass
+
+        for index, fmt in enumerate(formats):
             try:
-                return datetime.strptime(date_str, fmt).strftime("%Y-%m-%d")
+                parsed = datetime.strptime(date_str, fmt)
             except ValueError:
                 continue
+            if index:
+                formats.insert(0, formats.pop(index))
+            return parsed.strftime("%Y-%m-%d")
         raise ValueError(f"Unrecognized date format: '{date_str}'")
 
     def _parse_amount(self, amount_str: str) -> float:
         """Parse amount string, handling commas and currency symbols."""
-        cleaned = re.sub(r"[^\d.,\-+]", "", amount_str)
+        cleaned = amount_str.encode("ascii", "ignore").decode().translate(_AMOUNT_TRANSLATE)
         cleaned = cleaned.replace(",", ".")
         try:
             return float(cleaned)
@@ -145,15 +198,12 @@ class CSVImporter(ImporterBase):
         """Resolve category string to Category enum, defaulting to 'other'."""
         if not raw:
             return Category.other
-        normalized = raw.strip().lower()
-        if normalized in VALID_CATEGORIES:
-            return Category(normalized)
-        return Category.other
+        return CATEGORY_BY_VALUE.get(raw.lower(), Category.other)
 
     def _resolve_type(self, raw: str | None, amount: float) -> TransactionType:
         """Resolve transaction type from explicit value or amount sign."""
         if raw:
-            normalized = raw.strip().lower()
-            if normalized in ("income", "expense"):
-                return TransactionType(normalized)
+            txn_type = TRANSACTION_TYPE_BY_VALUE.get(raw.lower())
+            if txn_type is not None:
+                return txn_type
         return TransactionType.expense if amount < 0 else TransactionType.income
@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import json
 
@@ -5,8 +6,15 @@ import structlog
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 
+from app.llm.cache import cacheable_system_prompt
+from app.llm.json_utils import parse_llm_json
 from app.transactions.importers.base import ImporterBase
-from app.transactions.models import Category, TransactionType
+from app.transactions.models import (
+    CATEGORY_BY_VALUE,
+    TRANSACTION_TYPE_BY_VALUE,
+    Category,
+    TransactionType,
+)
 from app.transactions.schemas import TransactionCreate
 
 logger = structlog.get_logger()
@@ -23,6 +31,9 @@ insurance, debt_payment, other]
 
 Return ONLY valid JSON array, no other text."""
 
+# Encoding larger images is moved to a worker thread so it does not stall the event loop.
+OFFLOAD_ENCODE_BYTES = 1_000_000
+
 MIME_TYPES = {
     ".png": "image/png",
     ".jpg": "image/jpeg",
@@ -40,11 +51,14 @@ class ImageImporter(ImporterBase):
     ) -> tuple[list[TransactionCreate], list[str]]:
         """Send image to vision LLM and parse extracted transactions."""
         mime_type = self._detect_mime_type(filename)
-        b64_image = base64.b64encode(file_content).decode("utf-8")
+        if len(file_content) > OFFLOAD_ENCODE_BYTES:
+            encoded = await asyncio.to_thread(base64.b64encode, file_content)
+        else:
+            encoded = base64.b64encode(file_content)
+        b64_image = encoded.decode("utf-8")
 
         message = HumanMessage(
             content=[
-                {"type": "text", "text": EXTRACTION_PROMPT},
                 {
                     "type": "image_url",
                     "image_url": {"url": f"data:{mime_type};base64,{b64_image}"},
@@ -52,27 +66,24 @@ class ImageImporter(ImporterBase):
             ]
         )
 
-        response = await self._llm.ainvoke([message])
+        response = await self._llm.ainvoke(
+            [cacheable_system_prompt(self._llm, EXTRACTION_PROMPT), message]
+        )
         raw_text = response.content if isinstance(response.content, str) else str(response.content)
 
         return self._parse_llm_response(raw_text, filename)
 
     def _detect_mime_type(self, filename: str) -> str:
         """Detect MIME type from filename extension."""
-        lower = filename.lower()
-        for ext, mime in MIME_TYPES.items():
-            if lower.endswith(ext):
-                return mime
-        return "image/png"
+        ext = filename.rpartition(".")[2].lower()
+        return MIME_TYPES.get(f".{ext}", "image/png")
 
     def _parse_llm_response(
         self, raw_text: str, filename: str
     ) -> tuple[list[TransactionCreate], list[str]]:
         """Parse LLM JSON response into transactions and idempotency keys."""
-        json_str = self._extract_json(raw_text)
-
         try:
-            items = json.loads(json_str)
+            items = parse_llm_json(raw_text)
         except json.JSONDecodeError as exc:
             logger.error("image_llm_json_error", filename=filename, error=str(exc))
             return [], []
@@ -83,11 +94,12 @@ class ImageImporter(ImporterBase):
 
         transactions: list[TransactionCreate] = []
         idempotency_keys: list[str] = []
+        seen: dict[tuple, int] = {}
 
         for idx, item in enumerate(items):
             try:
                 txn = self._item_to_transaction(item)
-                key = self.generate_idempotency_key(txn.date, txn.amount, txn.description)
+                key = self.next_idempotency_key(seen, txn.date, txn.amount, txn.description)
                 transactions.append(txn)
                 idempotency_keys.append(key)
             except (ValueError, KeyError) as exc:
@@ -95,32 +107,17 @@ class ImageImporter(ImporterBase):
 
         return transactions, idempotency_keys
 
-    def _extract_json(self, raw_text: str) -> str:
-        """Strip markdown code fences if present."""
-        text = raw_text.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            # Remove first line (```json or ```) and last line (```)
-            lines = lines[1:]
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-            text = "\n".join(lines)
-        return text.strip()
-
     def _item_to_transaction(self, item: dict) -> TransactionCreate:
         """Convert a single parsed dict to TransactionCreate."""
-        category_raw = item.get("category", "other")
-        valid_categories = {c.value for c in Category}
-        category = category_raw if category_raw in valid_categories else "other"
-
-        type_raw = item.get("type", "expense")
-        valid_types = {t.value for t in TransactionType}
-        txn_type = type_raw if type_raw in valid_types else "expense"
+        category = CATEGORY_BY_VALUE.get(item.get("category", "other"), Category.other)
+        txn_type = TRANSACTION_TYPE_BY_VALUE.get(
+            item.get("type", "expense"), TransactionType.expense
+        )
 
         return TransactionCreate(
             date=item["date"],
             amount=abs(float(item["amount"])),
-            type=TransactionType(txn_type),
-            category=Category(category),
+            type=txn_type,
+            category=category,
             description=item.get("description"),
         )
@@ -1,19 +1,36 @@
+import asyncio
 import io
 import json
+import re
+from datetime import date, datetime
 
 import structlog
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import HumanMessage
 from pypdf import PdfReader
 
+from app.llm.cache import cacheable_system_prompt
+from app.llm.json_utils import parse_llm_json
 from app.transactions.importers.base import ImporterBase
-from app.transactions.models import Category, TransactionType
+from app.transactions.models import (
+    CATEGORY_BY_VALUE,
+    TRANSACTION_TYPE_BY_VALUE,
+    Category,
+    TransactionType,
+)
 from app.transactions.schemas import TransactionCreate
 
 logger = structlog.get_logger()
 
 MAX_TEXT_LENGTH = 10_000
 
+# Page-aligned prompt size for the LLM fallback; longer statements are sent as a batch.
+LLM_CHUNK_LENGTH = 3_000
+LLM_MAX_CONCURRENCY = 4
+
+# Share of statement lines that must look like "DATE AMOUNT DESCRIPTION" to skip the LLM.
+RULE_PARSE_MIN_RATIO = 0.8
+
 EXTRACTION_PROMPT = """Extract all financial transactions from the following text. \
 Return a JSON array where each element has:
 - "date": string in YYYY-MM-DD format
@@ -24,10 +41,12 @@ education, clothing, savings, investments, salary, freelance, gifts, subscriptio
 insurance, debt_payment, other]
 - "description": brief description
 
-Return ONLY valid JSON array, no other text.
+Return ONLY valid JSON array, no other text."""
+
 
-Text:
-{text}"""
+_TXN_LINE_RE = re.compile(
+    r"^(\d{4}-\d{2}-\d{2}|\d{2}[./]\d{2}[./]\d{4})\s+([-+]?\$?[\d,]+\.\d{2})\s+(.*)$"
+)
 
 
 class PDFImporter(ImporterBase):
@@ -38,45 +57,150 @@ class PDFImporter(ImporterBase):
         self, file_content: bytes, filename: str
     ) -> tuple[list[TransactionCreate], list[str]]:
         """Extract text from PDF, send to LLM, and parse transactions."""
-        text = self._extract_text(file_content, filename)
+        pages = await asyncio.to_thread(self._extract_pages, file_content, filename)
+        text = "\n\n".join(pages)
         if not text.strip():
             logger.warning("pdf_empty_text", filename=filename)
             return [], []
 
-        if len(text) > MAX_TEXT_LENGTH:
-            logger.warning(
-                "pdf_text_truncated",
-                filename=filename,
-                original_length=len(text),
-                truncated_to=MAX_TEXT_LENGTH,
-            )
-            text = text[:MAX_TEXT_LENGTH]
+        parsed = self._try_rule_based_parse(text)
+        if parsed is not None:
+            logger.info("pdf_rule_based_parse", filename=filename, count=len(parsed[0]))
+            return parsed
+
+        chunks = self._chunk_pages(pages)
+        # Dispatch the longest chunks first so the batch is not held up by a late straggler.
+        order = sorted(range(len(chunks)), key=lambda i: len(chunks[i]), reverse=True)
+        system = cacheable_system_prompt(self._llm, EXTRACTION_PROMPT)
+        responses = await self._llm.abatch(
+            [[system, HumanMessage(content=f"Text:\n{chunks[i]}")] for i in order],
+            config={"max_concurrency": LLM_MAX_CONCURRENCY},
+        )
+        if len(chunks) > 1:
+            logger.info("pdf_llm_batched", filename=filename, chunks=len(chunks))
 
-        prompt = EXTRACTION_PROMPT.format(text=text)
-        message = HumanMessage(content=prompt)
-        response = await self._llm.ainvoke([message])
-        raw_text = response.content if isinstance(response.content, str) else str(response.content)
+        raw_by_chunk: list[str] = [""] * len(chunks)
+        for i, response in zip(order, responses, strict=True):
+            content = response.content
+            raw_by_chunk[i] = content if isinstance(content, str) else str(content)
 
-        return self._parse_llm_response(raw_text, filename)
+        transactions: list[TransactionCreate] = []
+        idempotency_keys: list[str] = []
+        seen: dict[tuple, int] = {}
+        for raw_text in raw_by_chunk:
+            chunk_txns, chunk_keys = self._parse_llm_response(raw_text, filename, seen)
+            transactions.extend(chunk_txns)
+            idempotency_keys.extend(chunk_keys)
+        return transactions, idempotency_keys
 
-    def _extract_text(self, file_content: bytes, filename: str) -> str:
-        """Extract text from all PDF pages, concatenated with page separators."""
+    def _extract_pages(self, file_content: bytes, filename: str) -> list[str]:
+        """Extract labelled page texts, stopping once MAX_TEXT_LENGTH is reached."""
         reader = PdfReader(io.BytesIO(file_content))
         pages: list[str] = []
+        remaining = MAX_TEXT_LENGTH
         for i, page in enumerate(reader.pages):
             page_text = page.extract_text() or ""
-            if page_text.strip():
-                pages.append(f"--- Page {i + 1} ---\n{page_text}")
-        return "\n\n".join(pages)
+            if not page_text.strip():
+                continue
+            block = f"--- Page {i + 1} ---\n{page_text}"
+            if len(block) >= remaining:
+                # remaining drops to zero or below once the separator no longer fits.
+                if remaining > 0:
+                    pages.append(block[:remaining])
+                logger.warning(
+                    "pdf_text_truncated",
+                    filename=filename,
+                    pages_read=i + 1,
+                    total_pages=len(reader.pages),
+                    truncated_to=MAX_TEXT_LENGTH,
+                )
+                break
+            pages.append(block)
+            remaining -= len(block) + 2  # blank-line separator between pages
+        return pages
+
+    @staticmethod
+    def _chunk_pages(pages: list[str]) -> list[str]:
+        """Group consecutive pages into prompts of up to LLM_CHUNK_LENGTH characters."""
+        chunks: list[str] = []
+        current: list[str] = []
+        size = 0
+        for page in pages:
+            if current and size + len(page) > LLM_CHUNK_LENGTH:
+                chunks.append("\n\n".join(current))
+                current, size = [], 0
+            current.append(page)
+            size += len(page) + 2
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _try_rule_based_parse(self, text: str) -> tuple[list[TransactionCreate], list[str]] | None:
+        """Parse a plain tabular statement without the LLM, or return None if it is not one."""
+        transactions: list[TransactionCreate] = []
+        idempotency_keys: list[str] = []
+        seen: dict[tuple, int] = {}
+        candidate_lines = 0
+        has_debit = False
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("--- Page "):
+                continue
+            candidate_lines += 1
+            match = _TXN_LINE_RE.match(line)
+            if match is None:
+                continue
+            date_raw, amount_raw, description = match.groups()
+            try:
+                date_str = self._normalize_date(date_raw)
+            except ValueError:
+                continue
+            amount_val = float(amount_raw.replace("$", "").replace(",", ""))
+            try:
+                txn = TransactionCreate(
+                    date=date_str,
+                    amount=abs(amount_val),
+                    type=TransactionType.expense if amount_val < 0 else TransactionType.income,
+                    category=Category.other,
+                    description=description.strip() or None,
+                )
+            except ValueError:
+                continue
+            has_debit = has_debit or amount_val < 0
+            transactions.append(txn)
+            idempotency_keys.append(
+                self.next_idempotency_key(seen, txn.date, txn.amount, txn.description)
+            )
+
+        if not transactions or len(transactions) < candidate_lines * RULE_PARSE_MIN_RATIO:
+            return None
+        # Without a single negative amount the statement does not sign its debits, so
+        # income and expenses cannot be told apart here.
+        if not has_debit:
+            return None
+        return transactions, idempotency_keys
+
+    @staticmethod
+    def _normalize_date(date_raw: str) -> str:
+        """Return YYYY-MM-DD for an ISO or day-first dotted/slashed date."""
+        if date_raw[4:5] == "-":
+            return date.fromisoformat(date_raw).isoformat()
+        date_raw = date_raw.replace(".", "/")
+        try:
+            return datetime.strptime(date_raw, "%d/%m/%Y").strftime("%Y-%m-%d")
+        except ValueError:
+            return datetime.strptime(date_raw, "%m/%d/%Y").strftime("%Y-%m-%d")
 
     def _parse_llm_response(
-        self, raw_text: str, filename: str
+        self, raw_text: str, filename: str, seen: dict[tuple, int]
     ) -> tuple[list[TransactionCreate], list[str]]:
-        """Parse LLM JSON response into transactions and idempotency keys."""
-        json_str = self._extract_json(raw_text)
+        """Parse LLM JSON response into transactions and idempotency keys.
 
+        `seen` is shared across the chunks of one file so repeats are numbered file-wide.
+        """
         try:
-            items = json.loads(json_str)
+            items = parse_llm_json(raw_text)
         except json.JSONDecodeError as exc:
             logger.error("pdf_llm_json_error", filename=filename, error=str(exc))
             return [], []
@@ -91,7 +215,7 @@ class PDFImporter(ImporterBase):
         for idx, item in enumerate(items):
             try:
                 txn = self._item_to_transaction(item)
-                key = self.generate_idempotency_key(txn.date, txn.amount, txn.description)
+                key = self.next_idempotency_key(seen, txn.date, txn.amount, txn.description)
                 transactions.append(txn)
                 idempotency_keys.append(key)
             except (ValueError, KeyError) as exc:
@@ -99,31 +223,17 @@ class PDFImporter(ImporterBase):
 
         return transactions, idempotency_keys
 
-    def _extract_json(self, raw_text: str) -> str:
-        """Strip markdown code fences if present."""
-        text = raw_text.strip()
-        if text.startswith("```"):
-            lines = text.split("\n")
-            lines = lines[1:]
-            if lines and lines[-1].strip() == "```":
-                lines = lines[:-1]
-            text = "\n".join(lines)
-        return text.strip()
-
     def _item_to_transaction(self, item: dict) -> TransactionCreate:
         """Convert a single parsed dict to TransactionCreate."""
-        category_raw = item.get("category", "other")
-        valid_categories = {c.value for c in Category}
-        category = category_raw if category_raw in valid_categories else "other"
-
-        type_raw = item.get("type", "expense")
-        valid_types = {t.value for t in TransactionType}
-        txn_type = type_raw if type_raw in valid_types else "expense"
+        category = CATEGORY_BY_VALUE.get(item.get("category", "other"), Category.other)
+        txn_type = TRANSACTION_TYPE_BY_VALUE.get(
+            item.get("type", "expense"), TransactionType.expense
+        )
 
         return TransactionCreate(
             date=item["date"],
             amount=abs(float(item["amount"])),
-            type=TransactionType(txn_type),
-            category=Category(category),
+            type=txn_type,
+            category=category,
             description=item.get("description"),
         )
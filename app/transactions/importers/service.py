@@ -1,7 +1,8 @@
+from typing import BinaryIO
+
 import structlog
 from langchain_core.language_models import BaseChatModel
 
-from app.exceptions import ConflictError
 from app.transactions.importers.csv_importer import CSVImporter
 from app.transactions.importers.image_importer import ImageImporter
 from app.transactions.importers.pdf_importer import PDFImporter
@@ -15,24 +16,23 @@ logger = structlog.get_logger()
 class ImportService:
     def __init__(self, transaction_service: TransactionService, llm: BaseChatModel) -> None:
         self._transaction_service = transaction_service
-        self._llm = llm
+        self._csv = CSVImporter()
+        self._image = ImageImporter(llm)
+        self._pdf = PDFImporter(llm)
 
-    async def import_csv(self, file_content: bytes, filename: str) -> ImportResult:
+    async def import_csv(self, file_content: bytes | BinaryIO, filename: str) -> ImportResult:
         """Import transactions from a CSV file."""
-        importer = CSVImporter()
-        transactions, idempotency_keys = await importer.parse(file_content, filename)
+        transactions, idempotency_keys = await self._csv.parse(file_content, filename)
         return await self._create_transactions(transactions, idempotency_keys, filename)
 
     async def import_image(self, file_content: bytes, filename: str) -> ImportResult:
         """Import transactions from an image (receipt/screenshot)."""
-        importer = ImageImporter(self._llm)
-        transactions, idempotency_keys = await importer.parse(file_content, filename)
+        transactions, idempotency_keys = await self._image.parse(file_content, filename)
         return await self._create_transactions(transactions, idempotency_keys, filename)
 
     async def import_pdf(self, file_content: bytes, filename: str) -> ImportResult:
         """Import transactions from a PDF file."""
-        importer = PDFImporter(self._llm)
-        transactions, idempotency_keys = await importer.parse(file_content, filename)
+        transactions, idempotency_keys = await self._pdf.parse(file_content, filename)
         return await self._create_transactions(transactions, idempotency_keys, filename)
 
     async def _create_transactions(
@@ -41,29 +41,22 @@ class ImportService:
         idempotency_keys: list[str],
         filename: str,
     ) -> ImportResult:
-        """Create transactions via the transaction service, handling duplicates."""
+        """Create all parsed transactions in one bulk write, skipping known duplicates."""
         total_created = 0
-        total_skipped = 0
         total_failed = 0
         errors: list[str] = []
 
-        for i, txn in enumerate(transactions):
+        if transactions:
             try:
-                await self._transaction_service.create(txn)
-                total_created += 1
-            except ConflictError:
-                total_skipped += 1
-                logger.debug(
-                    "import_duplicate_skipped",
-                    filename=filename,
-                    row=i,
-                    key=idempotency_keys[i] if i < len(idempotency_keys) else None,
+                total_created = await self._transaction_service.create_bulk(
+                    transactions, idempotency_keys
                 )
             except Exception as exc:
-                total_failed += 1
-                error_msg = f"Row {i + 1}: {exc}"
-                errors.append(error_msg)
-                logger.warning("import_row_failed", filename=filename, row=i, error=str(exc))
+                total_failed = len(transactions)
+                errors.append(str(exc))
+                logger.warning("import_failed", filename=filename, error=str(exc))
+
+        total_skipped = len(transactions) - total_created - total_failed
 
         logger.info(
             "import_completed",
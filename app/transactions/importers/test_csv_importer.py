@@ -0,0 +1,58 @@
+import tempfile
+
+from app.transactions.importers.base import ImporterBase
+from app.transactions.importers.csv_importer import CSVImporter
+
+_CSV = (
+    "Date,Amount,Description,Category\n"
+    "2026-03-01,-12.50,Coffee,food\n"
+    '05/03/2026,"2500,00 EUR",Salary,salary\n'
+    "bad,-1.00,Broken,\n"
+    "\n"
+    "2026-03-01,-12.50,Coffee,food\n"
+)
+
+
+async def test_parses_rows_and_skips_invalid_ones():
+    transactions, keys = await CSVImporter().parse(_CSV.encode(), "s.csv")
+
+    assert [(t.date, t.amount, t.type.value, t.category.value) for t in transactions] == [
+        ("2026-03-01", 12.5, "expense", "food"),
+        ("2026-03-05", 2500.0, "income", "salary"),
+        ("2026-03-01", 12.5, "expense", "food"),
+    ]
+    assert len(keys) == 3
+
+
+async def test_repeated_rows_get_occurrence_numbered_keys():
+    _, keys = await CSVImporter().parse(_CSV.encode(), "s.csv")
+
+    # The first occurrence keeps the key it had before occurrences were counted.
+    assert keys[0] == ImporterBase.generate_idempotency_key("2026-03-01", 12.5, "Coffee")
+    assert keys[2] == ImporterBase.generate_idempotency_key("2026-03-01", 12.5, "Coffee", 1)
+    assert keys[0] != keys[2]
+
+
+async def test_streams_from_a_spooled_file_and_leaves_it_open():
+    with tempfile.SpooledTemporaryFile(max_size=16) as upload:
+        upload.write(_CSV.encode())
+        upload.seek(0)
+
+        transactions, _ = await CSVImporter().parse(upload, "s.csv")
+
+        assert len(transactions) == 3
+        assert not upload.closed
+
+
+async def test_falls_back_to_latin1_and_restarts_from_the_top():
+    rows = "".join(f"2026-03-{day:02d},-1.00,Row {day}\n" for day in range(1, 29))
+    content = ("Date,Amount,Description\n" + rows + "2026-03-29,-4.00,Café\n").encode("latin-1")
+
+    transactions, _ = await CSVImporter().parse(content, "s.csv")
+
+    assert len(transactions) == 29
+    assert transactions[-1].description == "Café"
+
+
+async def test_empty_file_yields_nothing():
+    assert await CSVImporter().parse(b"", "s.csv") == ([], [])
@@ -0,0 +1,103 @@
+import orjson
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.transactions.importers import pdf_importer
+from app.transactions.importers.pdf_importer import MAX_TEXT_LENGTH, PDFImporter
+
+
+class _FakePage:
+    def __init__(self, text: str) -> None:
+        self._text = text
+
+    def extract_text(self) -> str:
+        return self._text
+
+
+def _use_pages(monkeypatch, texts: list[str]) -> None:
+    class _FakeReader:
+        def __init__(self, stream) -> None:
+            self.pages = [_FakePage(text) for text in texts]
+
+    monkeypatch.setattr(pdf_importer, "PdfReader", _FakeReader)
+
+
+def _page_text(block_length: int, page_number: int = 1) -> str:
+    """Page text whose labelled block is exactly `block_length` characters."""
+    return "x" * (block_length - len(f"--- Page {page_number} ---\n"))
+
+
+def test_extract_pages_stops_when_no_room_is_left(monkeypatch):
+    _use_pages(monkeypatch, [_page_text(MAX_TEXT_LENGTH - 1), _page_text(5_014, 2)])
+
+    pages = PDFImporter(FakeListChatModel(responses=[]))._extract_pages(b"", "s.pdf")
+
+    assert len(pages) == 1
+    assert len("\n\n".join(pages)) <= MAX_TEXT_LENGTH
+
+
+def test_extract_pages_truncates_the_page_that_overflows(monkeypatch):
+    _use_pages(monkeypatch, [_page_text(6_000), "", _page_text(6_000, 3), _page_text(100, 4)])
+
+    pages = PDFImporter(FakeListChatModel(responses=[]))._extract_pages(b"", "s.pdf")
+
+    assert len(pages) == 2
+    assert pages[1].startswith("--- Page 3 ---")
+    assert len("\n\n".join(pages)) == MAX_TEXT_LENGTH
+
+
+async def test_long_statement_is_sent_as_a_batch_of_chunks(monkeypatch):
+    _use_pages(monkeypatch, [f"Page {n} has no tabular rows.\n" * 60 for n in range(1, 4)])
+    item = {"date": "2026-03-05", "amount": 12.5, "type": "expense", "category": "food"}
+    llm = FakeListChatModel(responses=[orjson.dumps([item]).decode()] * 3)
+
+    transactions, keys = await PDFImporter(llm).parse(b"", "s.pdf")
+
+    assert len(transactions) == 3
+    # Identical rows from different chunks are numbered file-wide.
+    assert len(set(keys)) == 3
+
+
+_STATEMENT = """--- Page 1 ---
+2026-03-01 -12.50 Grocery store
+05.03.2026 -$1,200.00 Rent
+2026-03-10 +2,500.00 Salary
+2026-03-11 -12.50 Grocery store"""
+
+
+async def test_tabular_statement_is_parsed_without_the_llm(monkeypatch):
+    _use_pages(monkeypatch, [_STATEMENT])
+
+    transactions, keys = await PDFImporter(FakeListChatModel(responses=[])).parse(b"", "s.pdf")
+
+    assert [(t.date, t.amount, t.type.value) for t in transactions] == [
+        ("2026-03-01", 12.5, "expense"),
+        ("2026-03-05", 1200.0, "expense"),
+        ("2026-03-10", 2500.0, "income"),
+        ("2026-03-11", 12.5, "expense"),
+    ]
+    assert len(set(keys)) == 4
+
+
+def test_rule_based_parse_skips_zero_amount_lines():
+    text = _STATEMENT + "\n2026-03-12 0.00 Card check"
+
+    parsed = PDFImporter(FakeListChatModel(responses=[]))._try_rule_based_parse(text)
+
+    assert parsed is not None
+    assert len(parsed[0]) == 4
+
+
+def test_rule_based_parse_falls_back_when_debits_are_unsigned():
+    text = "2026-03-01 12.50 Grocery store\n2026-03-02 40.00 Fuel"
+
+    parsed = PDFImporter(FakeListChatModel(responses=[]))._try_rule_based_parse(text)
+
+    assert parsed is None
+
+
+def test_rule_based_parse_falls_back_on_free_form_text():
+    text = "Dear customer,\nyour statement is attached.\n2026-03-01 -12.50 Grocery store"
+
+    parsed = PDFImporter(FakeListChatModel(responses=[]))._try_rule_based_parse(text)
+
+    assert parsed is None
@@ -24,3 +24,8 @@ class Category(StrEnum):
 class TransactionType(StrEnum):
     income = "income"
     expense = "expense"
+
+
+# Value -> member maps so parsers resolve raw strings with one dict lookup.
+CATEGORY_BY_VALUE: dict[str, Category] = {c.value: c for c in Category}
+TRANSACTION_TYPE_BY_VALUE: dict[str, TransactionType] = {t.value: t for t in TransactionType}
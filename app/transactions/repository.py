@@ -1,145 +1,186 @@
-from datetime import UTC, datetime
-
 import aiosqlite
 import structlog
 
+from app.database import SqlitePool
 from app.transactions.schemas import TransactionFilter
 
 logger = structlog.get_logger()
 
-
-def _months_ago(months: int) -> datetime:
-    """Return a datetime that is `months` months before now (UTC)."""
-    now = datetime.now(UTC)
-    month = now.month - months
-    year = now.year
-    while month < 1:
-        month += 12
-        year -= 1
-    day = min(now.day, 28)
-    return now.replace(year=year, month=month, day=day)
+# Statements are module constants so each pooled connection's statement cache
+# keeps reusing the same prepared statements.
+TRANSACTION_FIELDS = (
+    "id",
+    "type",
+    "amount",
+    "currency",
+    "category",
+    "description",
+    "date",
+    "is_deleted",
+    "created_at",
+    "updated_at",
+)
+_TRANSACTION_COLUMNS = ", ".join(TRANSACTION_FIELDS)
+
+SUMMARY_FIELDS = (
+    "year_month",
+    "category",
+    "total_income",
+    "total_expenses",
+    "transaction_count",
+)
+
+_SQL_GET_BY_ID = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions_projection
+    WHERE id = ?
+"""
+
+_SQL_SUMMARY_FOR_MONTH = """
+    SELECT year_month, category, total_income, total_expenses, transaction_count
+    FROM monthly_summary_projection
+    WHERE year_month = ?
+    ORDER BY category
+"""
+
+_SQL_SUMMARY_ALL = """
+    SELECT year_month, category, total_income, total_expenses, transaction_count
+    FROM monthly_summary_projection
+    ORDER BY year_month DESC, category
+"""
+
+# Same day `:months` ago, clamped to the last day of a shorter target month.
+_SQL_RECENT = f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions_projection
+    WHERE is_deleted = 0 AND date >= min(
+        date('now', :months),
+        date('now', 'start of month', :months, '+1 month', '-1 day')
+    )
+    ORDER BY date DESC
+"""
+
+_SQL_SPENDING_TREND = """
+    SELECT year_month, category, total_income, total_expenses, transaction_count
+    FROM monthly_summary_projection
+    WHERE category = ? AND year_month >= strftime('%Y-%m', 'now', 'start of month', ?)
+    ORDER BY year_month ASC
+"""
+
+_SQL_SAVINGS_TOTALS = """
+    SELECT
+        COALESCE(SUM(total_income), 0) AS total_income,
+        COALESCE(SUM(total_expenses), 0) AS total_expenses
+    FROM monthly_summary_projection
+    WHERE year_month >= strftime('%Y-%m', 'now', 'start of month', ?)
+"""
+
+
+# Optional `list_filtered` conditions, in mask bit order.
+_LIST_FILTERS = (
+    ("date_from", "date >= ?"),
+    ("date_to", "date <= ?"),
+    ("category", "category = ?"),
+    ("type", "type = ?"),
+)
+
+
+def _list_filtered_sql(mask: int) -> str:
+    conditions = ["is_deleted = 0"]
+    conditions.extend(cond for bit, (_, cond) in enumerate(_LIST_FILTERS) if mask & (1 << bit))
+    return f"""
+    SELECT {_TRANSACTION_COLUMNS}
+    FROM transactions_projection
+    WHERE {" AND ".join(conditions)}
+    ORDER BY date DESC
+    LIMIT ? OFFSET ?
+"""
+
+
+# One statement per combination of present filters, keyed by the presence bitmask.
+_SQL_LIST_FILTERED = tuple(_list_filtered_sql(mask) for mask in range(1 << len(_LIST_FILTERS)))
+
+
+def _months_modifier(months: int) -> str:
+    """SQLite date modifier for `months` months ago; cutoffs are computed in SQL."""
+    return f"-{int(months)} months"
+
+
+def transaction_row_to_dict(row: tuple) -> dict:
+    """Map a transaction row tuple (in `TRANSACTION_FIELDS` order) to a dict."""
+    return dict(zip(TRANSACTION_FIELDS, row, strict=True))
+
+
+def summary_row_to_dict(row: tuple) -> dict:
+    """Map a monthly summary row tuple (in `SUMMARY_FIELDS` order) to a dict."""
+    return dict(zip(SUMMARY_FIELDS, row, strict=True))
 
 
 class TransactionRepository:
-    def __init__(self, db: aiosqlite.Connection) -> None:
-        self._db = db
-
-    async def get_by_id(self, transaction_id: str) -> dict | None:
-        cursor = await self._db.execute(
-            """
-            SELECT id, type, amount, currency, category, description,
-                   date, is_deleted, created_at, updated_at
-            FROM transactions_projection
-            WHERE id = ?
-            """,
-            (transaction_id,),
-        )
-        row = await cursor.fetchone()
-        if row is None:
-            return None
-        return dict(row)
-
-    async def list_filtered(self, filters: TransactionFilter) -> list[dict]:
-        conditions: list[str] = ["is_deleted = 0"]
+    """Read-only queries over the transaction projections, served from the read pool.
+
+    Transaction and summary rows are returned as plain tuples in `TRANSACTION_FIELDS`
+    and `SUMMARY_FIELDS` order.
+    """
+
+    def __init__(self, pool: SqlitePool) -> None:
+        self._pool = pool
+
+    async def get_by_id(
+        self, transaction_id: str, db: aiosqlite.Connection | None = None
+    ) -> tuple | None:
+        """Fetch one row from the read pool, or from `db` when reading inside a write."""
+        if db is not None:
+            return await self._fetch_by_id(db, transaction_id)
+        async with self._pool.read() as db:
+            return await self._fetch_by_id(db, transaction_id)
+
+    @staticmethod
+    async def _fetch_by_id(db: aiosqlite.Connection, transaction_id: str) -> tuple | None:
+        cursor = await db.execute(_SQL_GET_BY_ID, (transaction_id,))
+        cursor.row_factory = None
+        return await cursor.fetchone()
+
+    async def list_filtered(self, filters: TransactionFilter) -> list[tuple]:
+        mask = 0
         params: list = []
-
-        if filters.date_from is not None:
-            conditions.append("date >= ?")
-            params.append(filters.date_from)
-        if filters.date_to is not None:
-            conditions.append("date <= ?")
-            params.append(filters.date_to)
-        if filters.category is not None:
-            conditions.append("category = ?")
-            params.append(filters.category)
-        if filters.type is not None:
-            conditions.append("type = ?")
-            params.append(filters.type)
-
-        where_clause = " AND ".join(conditions)
+        for bit, (name, _) in enumerate(_LIST_FILTERS):
+            value = getattr(filters, name)
+            if value is not None:
+                mask |= 1 << bit
+                params.append(value)
         params.extend([filters.limit, filters.offset])
 
-        cursor = await self._db.execute(
-            f"""
-            SELECT id, type, amount, currency, category, description,
-                   date, is_deleted, created_at, updated_at
-            FROM transactions_projection
-            WHERE {where_clause}
-            ORDER BY date DESC
-            LIMIT ? OFFSET ?
-            """,
-            params,
-        )
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
-
-    async def get_summary(self, year_month: str | None = None) -> list[dict]:
-        if year_month is not None:
-            cursor = await self._db.execute(
-                """
-                SELECT year_month, category, total_income, total_expenses, transaction_count
-                FROM monthly_summary_projection
-                WHERE year_month = ?
-                ORDER BY category
-                """,
-                (year_month,),
-            )
-        else:
-            cursor = await self._db.execute(
-                """
-                SELECT year_month, category, total_income, total_expenses, transaction_count
-                FROM monthly_summary_projection
-                ORDER BY year_month DESC, category
-                """
-            )
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
-
-    async def get_recent(self, months: int = 3) -> list[dict]:
-        cutoff_date = _months_ago(months).strftime("%Y-%m-%d")
-
-        cursor = await self._db.execute(
-            """
-            SELECT id, type, amount, currency, category, description,
-                   date, is_deleted, created_at, updated_at
-            FROM transactions_projection
-            WHERE is_deleted = 0 AND date >= ?
-            ORDER BY date DESC
-            """,
-            (cutoff_date,),
-        )
-        rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+        async with self._pool.read() as db:
+            cursor = await db.execute(_SQL_LIST_FILTERED[mask], params)
+            cursor.row_factory = None
+            return await cursor.fetchall()
+
+    async def get_summary(self, year_month: str | None = None) -> list[tuple]:
+        async with self._pool.read() as db:
+            if year_month is not None:
+                cursor = await db.execute(_SQL_SUMMARY_FOR_MONTH, (year_month,))
+            else:
+                cursor = await db.execute(_SQL_SUMMARY_ALL)
+            cursor.row_factory = None
+            return await cursor.fetchall()
+
+    async def get_recent(self, months: int = 3) -> list[tuple]:
+        async with self._pool.read() as db:
+            cursor = await db.execute(_SQL_RECENT, {"months": _months_modifier(months)})
+            cursor.row_factory = None
+            return await cursor.fetchall()
 
     async def get_spending_trend(self, category: str, months: int = 6) -> list[dict]:
-        cutoff_month = _months_ago(months).strftime("%Y-%m")
-
-        cursor = await self._db.execute(
-            """
-            SELECT year_month, category, total_income, total_expenses, transaction_count
-            FROM monthly_summary_projection
-            WHERE category = ? AND year_month >= ?
-            ORDER BY year_month ASC
-            """,
-            (category, cutoff_month),
-        )
-        rows = await cursor.fetchall()
+        async with self._pool.read() as db:
+            cursor = await db.execute(_SQL_SPENDING_TREND, (category, _months_modifier(months)))
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
     async def calculate_savings_rate(self, months: int = 3) -> dict:
-        cutoff_month = _months_ago(months).strftime("%Y-%m")
-
-        cursor = await self._db.execute(
-            """
-            SELECT
-                COALESCE(SUM(total_income), 0) AS total_income,
-                COALESCE(SUM(total_expenses), 0) AS total_expenses
-            FROM monthly_summary_projection
-            WHERE year_month >= ?
-            """,
-            (cutoff_month,),
-        )
-        row = await cursor.fetchone()
+        async with self._pool.read() as db:
+            cursor = await db.execute(_SQL_SAVINGS_TOTALS, (_months_modifier(months),))
+            row = await cursor.fetchone()
         total_income = row["total_income"] if row else 0.0
         total_expenses = row["total_expenses"] if row else 0.0
         net_savings = total_income - total_expenses
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Query, UploadFile
 
+from app.config import settings
 from app.dependencies import APIKey, ImportServiceDep, TransactionServiceDep
+from app.exceptions import ValidationError
 from app.transactions.importers.schemas import ImportResult
 from app.transactions.models import Category, TransactionType
 from app.transactions.schemas import (
@@ -14,6 +16,22 @@ from app.transactions.schemas import (
 router = APIRouter()
 
 
+def _check_upload_size(file: UploadFile) -> None:
+    limit = settings.max_upload_bytes
+    if file.size is not None and file.size > limit:
+        raise ValidationError(f"File exceeds the {limit} byte upload limit")
+
+
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an upload that must be processed whole, rejecting it past the size limit."""
+    _check_upload_size(file)
+    limit = settings.max_upload_bytes
+    content = await file.read(limit + 1)
+    if len(content) > limit:
+        raise ValidationError(f"File exceeds the {limit} byte upload limit")
+    return content
+
+
 @router.post("/", status_code=201, response_model=TransactionResponse)
 async def create_transaction(
     data: TransactionCreate,
@@ -88,8 +106,8 @@ async def import_csv(
     service: ImportServiceDep,
     _api_key: APIKey,
 ) -> ImportResult:
-    content = await file.read()
-    return await service.import_csv(content, file.filename or "upload.csv")
+    _check_upload_size(file)
+    return await service.import_csv(file.file, file.filename or "upload.csv")
 
 
 @router.post("/import/image", status_code=201, response_model=ImportResult)
@@ -98,7 +116,7 @@ async def import_image(
     service: ImportServiceDep,
     _api_key: APIKey,
 ) -> ImportResult:
-    content = await file.read()
+    content = await _read_upload(file)
     return await service.import_image(content, file.filename or "upload.png")
 
 
@@ -108,5 +126,5 @@ async def import_pdf(
     service: ImportServiceDep,
     _api_key: APIKey,
 ) -> ImportResult:
-    content = await file.read()
+    content = await _read_upload(file)
     return await service.import_pdf(content, file.filename or "upload.pdf")
@@ -1,11 +1,17 @@
 from uuid import uuid4
 
+import aiosqlite
 import structlog
 
 from app.event_store.models import AggregateType, EventType
 from app.event_store.service import EventStoreService
 from app.exceptions import NotFoundError, ValidationError
-from app.transactions.repository import TransactionRepository
+from app.transactions.cache import (
+    invalidate_transaction_caches,
+    savings_rate_cache,
+    summary_cache,
+)
+from app.transactions.repository import TRANSACTION_FIELDS, TransactionRepository
 from app.transactions.schemas import (
     MonthlySummary,
     TransactionCreate,
@@ -16,6 +22,8 @@ from app.transactions.schemas import (
 
 logger = structlog.get_logger()
 
+_IS_DELETED = TRANSACTION_FIELDS.index("is_deleted")
+
 
 class TransactionService:
     def __init__(
@@ -28,33 +36,59 @@ class TransactionService:
 
     async def create(self, data: TransactionCreate) -> TransactionResponse:
         transaction_id = str(uuid4())
+        event_data = self._created_event_data(data)
 
-        event_data = {
-            "type": data.type,
-            "amount": data.amount,
-            "category": data.category,
-            "description": data.description,
-            "date": data.date,
-            "currency": data.currency,
-        }
-
-        await self._event_store.append_event(
+        event = await self._event_store.append_event(
             aggregate_type=AggregateType.transaction,
             aggregate_id=transaction_id,
             event_type=EventType.transaction_created,
             event_data=event_data,
         )
 
-        row = await self._repo.get_by_id(transaction_id)
-        if row is None:
-            raise ValidationError("Failed to create transaction")
-
+        # The created projection row is fully determined by the event; no need to read it back.
+        row = (
+            transaction_id,
+            event_data["type"],
+            event_data["amount"],
+            event_data["currency"],
+            event_data["category"],
+            event_data["description"],
+            event_data["date"],
+            0,
+            event.created_at,
+            event.created_at,
+        )
+        invalidate_transaction_caches()
         logger.info("transaction_created", transaction_id=transaction_id)
         return self._to_response(row)
 
+    async def create_bulk(
+        self, items: list[TransactionCreate], idempotency_keys: list[str] | None = None
+    ) -> int:
+        """Create many transactions in one transaction; returns how many were stored.
+
+        Items whose idempotency key was already used are skipped.
+        """
+        keys: list[str | None] = (
+            list(idempotency_keys) if idempotency_keys is not None else [None] * len(items)
+        )
+        events = await self._event_store.append_events_bulk(
+            aggregate_type=AggregateType.transaction,
+            event_type=EventType.transaction_created,
+            entries=[
+                (str(uuid4()), self._created_event_data(data), key)
+                for data, key in zip(items, keys, strict=True)
+            ],
+        )
+
+        if events:
+            invalidate_transaction_caches()
+        logger.info("transactions_bulk_created", created=len(events), requested=len(items))
+        return len(events)
+
     async def get_by_id(self, transaction_id: str) -> TransactionResponse:
         row = await self._repo.get_by_id(transaction_id)
-        if row is None or row["is_deleted"]:
+        if row is None or row[_IS_DELETED]:
             raise NotFoundError("Transaction", transaction_id)
         return self._to_response(row)
 
@@ -64,30 +98,38 @@ class TransactionService:
 
     async def update(self, transaction_id: str, data: TransactionUpdate) -> TransactionResponse:
         existing = await self._repo.get_by_id(transaction_id)
-        if existing is None or existing["is_deleted"]:
+        if existing is None or existing[_IS_DELETED]:
             raise NotFoundError("Transaction", transaction_id)
 
         update_data = data.model_dump(exclude_none=True)
         if not update_data:
             raise ValidationError("No fields to update")
 
+        updated: tuple | None = None
+
+        async def read_back(db: aiosqlite.Connection) -> None:
+            # Read inside the write transaction so the response is exactly this update's
+            # result, even if another update to the same row commits around it.
+            nonlocal updated
+            updated = await self._repo.get_by_id(transaction_id, db)
+            if updated is None or updated[_IS_DELETED]:
+                raise NotFoundError("Transaction", transaction_id)
+
         await self._event_store.append_event(
             aggregate_type=AggregateType.transaction,
             aggregate_id=transaction_id,
             event_type=EventType.transaction_updated,
             event_data=update_data,
+            on_projected=read_back,
         )
 
-        row = await self._repo.get_by_id(transaction_id)
-        if row is None:
-            raise NotFoundError("Transaction", transaction_id)
-
+        invalidate_transaction_caches()
         logger.info("transaction_updated", transaction_id=transaction_id)
-        return self._to_response(row)
+        return self._to_response(updated)
 
     async def delete(self, transaction_id: str) -> None:
         existing = await self._repo.get_by_id(transaction_id)
-        if existing is None or existing["is_deleted"]:
+        if existing is None or existing[_IS_DELETED]:
             raise NotFoundError("Transaction", transaction_id)
 
         await self._event_store.append_event(
@@ -97,19 +139,23 @@ class TransactionService:
             event_data={"deleted": True},
         )
 
+        invalidate_transaction_caches()
         logger.info("transaction_deleted", transaction_id=transaction_id)
 
     async def get_summary(self, year_month: str | None = None) -> list[MonthlySummary]:
+        return await summary_cache.get_or_load(year_month, lambda: self._load_summary(year_month))
+
+    async def _load_summary(self, year_month: str | None) -> list[MonthlySummary]:
         rows = await self._repo.get_summary(year_month)
         return [
-            MonthlySummary(
-                year_month=row["year_month"],
-                category=row["category"],
-                total_income=row["total_income"],
-                total_expenses=row["total_expenses"],
-                transaction_count=row["transaction_count"],
+            MonthlySummary.model_construct(
+                year_month=ym,
+                category=category,
+                total_income=income,
+                total_expenses=expenses,
+                transaction_count=count,
             )
-            for row in rows
+            for ym, category, income, expenses, count in rows
         ]
 
     async def get_recent(self, months: int = 3) -> list[TransactionResponse]:
@@ -120,18 +166,41 @@ class TransactionService:
         return await self._repo.get_spending_trend(category, months)
 
     async def calculate_savings_rate(self, months: int = 3) -> dict:
-        return await self._repo.calculate_savings_rate(months)
-
-    def _to_response(self, row: dict) -> TransactionResponse:
-        return TransactionResponse(
-            id=row["id"],
-            type=row["type"],
-            amount=row["amount"],
-            currency=row["currency"],
-            category=row["category"],
-            description=row["description"],
-            date=row["date"],
-            is_deleted=bool(row["is_deleted"]),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
+        return await savings_rate_cache.get_or_load(
+            months, lambda: self._repo.calculate_savings_rate(months)
+        )
+
+    @staticmethod
+    def _created_event_data(data: TransactionCreate) -> dict:
+        # Every TransactionCreate field is event payload; copy the validated values
+        # instead of going through model_dump.
+        return data.__dict__.copy()
+
+    def _to_response(self, row: tuple) -> TransactionResponse:
+        # Rows come straight from the projection, so validation is skipped. Responses are
+        # only built for live rows (every caller filters or checks is_deleted first), so
+        # the flag is a constant rather than a per-row conversion.
+        (
+            transaction_id,
+            txn_type,
+            amount,
+            currency,
+            category,
+            description,
+            date,
+            _is_deleted,
+            created_at,
+            updated_at,
+        ) = row
+        return TransactionResponse.model_construct(
+            id=transaction_id,
+            type=txn_type,
+            amount=amount,
+            currency=currency,
+            category=category,
+            description=description,
+            date=date,
+            is_deleted=False,
+            created_at=created_at,
+            updated_at=updated_at,
         )